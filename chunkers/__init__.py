@@ -2,7 +2,7 @@
 Chunkers package for extracting code elements from different languages
 """
 
-from .base_chunker import BaseChunker, CodeChunk
+from .base_chunker import BaseChunker, CodeChunk, CodeChunkBatch
 from .cpp_chunker import CppChunker
 from .python_chunker import PythonChunker
 from .javascript_chunker import JavaScriptChunker
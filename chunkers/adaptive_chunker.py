@@ -46,7 +46,7 @@ class AdaptiveChunker(BaseChunker):
                 # Only log each language error once to avoid console spam
                 if language not in _LOGGED_ERRORS:
                     _LOGGED_ERRORS.add(language)
-                    self.logger.warning(f"Could not create tree-sitter chunker for {language}: {e}")
+                    self.logger.warning("Could not create tree-sitter chunker for %s: %s", language, e)
     
     def extract_chunks(self, code: str, filepath: str) -> List[CodeChunk]:
         """
@@ -59,21 +59,21 @@ class AdaptiveChunker(BaseChunker):
             try:
                 chunks = self.ts_chunker.extract_chunks(code, filepath)
                 if chunks:
-                    self.logger.debug(f"{filepath}: Used tree-sitter chunking ({len(chunks)} chunks)")
+                    self.logger.debug("%s: Used tree-sitter chunking (%s chunks)", filepath, len(chunks))
                     return chunks
             except Exception as e:
-                self.logger.warning(f"{filepath}: Tree-sitter failed: {e}")
+                self.logger.warning("%s: Tree-sitter failed: %s", filepath, e)
         
         # Strategy 2: Use architecture-specific fallback
         chunks = self._extract_by_architecture(code, filepath)
         if chunks:
-            self.logger.debug(f"{filepath}: Used {self.architecture.value} chunking ({len(chunks)} chunks)")
+            self.logger.debug("%s: Used %s chunking (%s chunks)", filepath, self.architecture.value, len(chunks))
             return chunks
         
         # Strategy 3: Generic paragraph fallback
         fallback = FallbackChunker(self.language, strategy="paragraph")
         chunks = fallback.extract_chunks(code, filepath)
-        self.logger.debug(f"{filepath}: Used fallback chunking ({len(chunks)} chunks)")
+        self.logger.debug("%s: Used fallback chunking (%s chunks)", filepath, len(chunks))
         
         return chunks
     
@@ -4,8 +4,8 @@ Base chunker class defining the interface for all language-specific chunkers
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
-from dataclasses import dataclass
+from typing import List, Dict, Optional, Sequence
+from dataclasses import dataclass, field, fields
 
 
 @dataclass
@@ -40,6 +40,60 @@ class CodeChunk:
         }
 
 
+@dataclass
+class CodeChunkBatch:
+    """
+    Column-wise (struct-of-arrays) batch of code chunks
+    Each field holds one list with an entry per chunk, so bulk consumers
+    (embedding, database inserts) take a whole column at once
+    """
+    type: List[str] = field(default_factory=list)
+    name: List[str] = field(default_factory=list)
+    content: List[str] = field(default_factory=list)
+    filepath: List[str] = field(default_factory=list)
+    language: List[str] = field(default_factory=list)
+    line_start: List[int] = field(default_factory=list)
+    line_end: List[int] = field(default_factory=list)
+    signature: List[Optional[str]] = field(default_factory=list)
+    namespace: List[Optional[str]] = field(default_factory=list)
+    parent_class: List[Optional[str]] = field(default_factory=list)
+    metadata: List[Optional[Dict]] = field(default_factory=list)
+    
+    @classmethod
+    def from_chunks(cls, chunks: Sequence[CodeChunk]) -> 'CodeChunkBatch':
+        """Convert a list of CodeChunk objects"""
+        return cls(**{
+            f.name: [getattr(chunk, f.name) for chunk in chunks]
+            for f in fields(cls)
+        })
+    
+    def __len__(self) -> int:
+        return len(self.content)
+    
+    def to_dicts(self) -> List[Dict]:
+        """Per-chunk dictionaries for database storage (as CodeChunk.to_dict)"""
+        return [
+            {
+                'type': chunk_type,
+                'name': name,
+                'content': content,
+                'filepath': filepath,
+                'language': language,
+                'line_start': line_start,
+                'line_end': line_end,
+                'signature': signature or '',
+                'namespace': namespace or '',
+                'parent_class': parent_class or '',
+                'metadata': str(metadata) if metadata else ''
+            }
+            for (chunk_type, name, content, filepath, language, line_start, line_end,
+                 signature, namespace, parent_class, metadata)
+            in zip(self.type, self.name, self.content, self.filepath, self.language,
+                   self.line_start, self.line_end, self.signature, self.namespace,
+                   self.parent_class, self.metadata)
+        ]
+
+
 class BaseChunker(ABC):
     """Abstract base class for all code chunkers"""
     
@@ -30,23 +30,19 @@ class GenericTreeSitterChunker(BaseChunker):
         try:
             # Use tree-sitter-language-pack for simplified language loading
             from tree_sitter_language_pack import get_language, get_parser
-            import tree_sitter
+            from config import get_compiled_query
             
             self.ts_language = get_language(language_name)
             self.parser = get_parser(language_name)
             
-            # Handle API changes in tree-sitter
-            try:
-                self.query = tree_sitter.Query(self.ts_language, query_scm)
-            except AttributeError:
-                # Fallback for older versions
-                self.query = self.ts_language.query(query_scm)
+            # Compiled once per process and shared by every chunker instance
+            self.query = get_compiled_query(language_name, query_scm, self.ts_language)
             
         except ImportError as e:
-            self.logger.error(f"Could not import tree-sitter-language-pack. Install it with: pip install tree-sitter-language-pack")
+            self.logger.error("Could not import tree-sitter-language-pack. Install it with: pip install tree-sitter-language-pack")
             raise
         except Exception as e:
-            self.logger.error(f"Failed to initialize {language_name} parser: {e}")
+            self.logger.error("Failed to initialize %s parser: %s", language_name, e)
             raise
 
     def extract_chunks(self, code: str, filepath: str) -> List[CodeChunk]:
@@ -58,7 +54,9 @@ class GenericTreeSitterChunker(BaseChunker):
             
         try:
             import tree_sitter
-            tree = self.parser.parse(bytes(code, "utf8"))
+            # Encode once; captures are sliced out of this buffer by byte offset
+            source = code.encode("utf8")
+            tree = self.parser.parse(source)
             
             # Handle API changes in tree-sitter QueryCursor
             try:
@@ -78,7 +76,7 @@ class GenericTreeSitterChunker(BaseChunker):
                     if not isinstance(nodes, list):
                         nodes = [nodes]
                     for node in nodes:
-                        self._process_capture(node, tag, code, filepath, chunks)
+                        self._process_capture(node, tag, source, filepath, chunks)
             else:
                 # Old API: list of tuples or objects
                 for capture in captures:
@@ -87,20 +85,20 @@ class GenericTreeSitterChunker(BaseChunker):
                     else:
                         node = capture.node
                         tag = capture.name
-                    self._process_capture(node, tag, code, filepath, chunks)
+                    self._process_capture(node, tag, source, filepath, chunks)
                 
             return chunks
             
         except Exception as e:
-            self.logger.error(f"Error chunking {self.language}: {e}")
+            self.logger.error("Error chunking %s: %s", self.language, e)
             return []
 
-    def _process_capture(self, node, tag: str, code: str, filepath: str, chunks: List[CodeChunk]):
+    def _process_capture(self, node, tag: str, source: bytes, filepath: str, chunks: List[CodeChunk]):
         """Process a single capture and add to chunks list"""
         # Extract text
         start_byte = node.start_byte
         end_byte = node.end_byte
-        text = code.encode('utf8')[start_byte:end_byte].decode('utf8')
+        text = source[start_byte:end_byte].decode('utf8')
         
         # Map tag to chunk type
         chunk_type = self._map_tag_to_type(tag)
@@ -110,7 +108,7 @@ class GenericTreeSitterChunker(BaseChunker):
         # Try to find a name child
         name_node = node.child_by_field_name("name")
         if name_node:
-            name = code.encode('utf8')[name_node.start_byte:name_node.end_byte].decode('utf8')
+            name = source[name_node.start_byte:name_node.end_byte].decode('utf8')
         
         chunks.append(CodeChunk(
             type=chunk_type,
@@ -10,7 +10,7 @@ from pathlib import Path
 
 from rag import ChromeRAGSystem, VulnerabilityAnalyzer
 from indexer import ChromeIndexer
-from config import CONFIG
+from config import get_config
 from utils.logger import (
     setup_logger, print_success, print_error, print_warning,
     print_header, print_stats, console
@@ -19,6 +19,14 @@ from rich.table import Table
 from rich.syntax import Syntax
 
 
+def _clear_ast_cache(db_path: str):
+    """Drop cached parse results so the next index re-parses everything"""
+    cache_path = get_config().get_ast_cache_path(db_path)
+    if cache_path:
+        from utils.cache import ASTCache
+        ASTCache(cache_path).clear()
+
+
 def cmd_index(args):
     """Index a Chrome source directory"""
     print_header("Chrome Source Code Indexer")
@@ -42,9 +50,11 @@ def cmd_index(args):
         print_warning("Clearing existing database...")
         rag.clear_collection()
         indexer.state_manager.clear()
+        _clear_ast_cache(rag.db_path)
     elif args.force:
         print_warning("Forcing re-index (clearing state)...")
         indexer.state_manager.clear()
+        _clear_ast_cache(rag.db_path)
     
     # Parse file types filter
     file_types = args.file_types.split(',') if args.file_types else None
@@ -239,6 +249,7 @@ def cmd_clear(args):
     # Clear incremental state
     from utils.state_manager import StateManager
     StateManager().clear()
+    _clear_ast_cache(rag.db_path)
     
     print_success("Database cleared successfully")
     return 0
@@ -246,6 +257,7 @@ def cmd_clear(args):
 
 def main():
     """Main CLI entry point"""
+    config = get_config()
     parser = argparse.ArgumentParser(
         description="Chrome Source Code RAG System - Professional code indexing and search",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -270,8 +282,8 @@ Examples:
     
     parser.add_argument(
         '--db-path',
-        default=CONFIG.db_path,
-        help=f'Path to ChromaDB database (default: {CONFIG.db_path})'
+        default=config.db_path,
+        help=f'Path to ChromaDB database (default: {config.db_path})'
     )
     
     parser.add_argument(
@@ -287,7 +299,7 @@ Examples:
     index_parser = subparsers.add_parser('index', help='Index Chrome source directory')
     index_parser.add_argument('--path', required=True, help='Path to Chrome src/ directory')
     index_parser.add_argument('--file-types', help='Comma-separated list of file types (cpp,python,javascript,mojom,gn)')
-    index_parser.add_argument('--batch-size', type=int, default=CONFIG.batch_size, help=f'Batch size for database operations (default: {CONFIG.batch_size})')
+    index_parser.add_argument('--batch-size', type=int, default=config.batch_size, help=f'Batch size for database operations (default: {config.batch_size})')
     index_parser.add_argument('--clear', action='store_true', help='Clear existing database before indexing')
     index_parser.add_argument('--force', action='store_true', help='Force re-indexing of all files (ignore incremental state)')
     index_parser.add_argument('--no-parallel', action='store_true', help='Disable parallel processing (use single thread)')
@@ -2,17 +2,30 @@
 """
 Configuration management for Chrome RAG System
 Centralizes all settings for file types, parsers, and processing parameters
+
+Environment overrides (read once when the config is built):
+    CRAG_BATCH_SIZE      Chunks per database insert (default: 100)
+    CRAG_MAX_CHUNK       Maximum chunk size in characters (default: 8000)
+    CRAG_MIN_CHUNK       Minimum chunk size in characters (default: 50)
+    CRAG_MAX_FILE_SIZE   Largest file to index, in bytes (default: 2 MiB)
+    CRAG_RICH_LOGS       Any non-empty value logs through Rich (see utils.logger)
 """
 
+import functools
+import os
+import sys
+import threading
+import types
+from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import Dict, List, Set, Optional
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Set, Optional, Tuple
 from pathlib import Path
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class FileTypeConfig:
     """Configuration for each supported file type"""
-    extensions: List[str]
+    extensions: Tuple[str, ...]
     language: str
     parser_type: str  # 'treesitter' or 'regex'
     description: str = ""
@@ -20,6 +33,374 @@ class FileTypeConfig:
     query_scm: Optional[str] = None
 
 
+# Compiled tree-sitter queries keyed by (language, query source). Entries are
+# never evicted: compiling is the expensive part and there is one per language.
+# Failed compilations are cached too, so a bad query is only tried once.
+_QUERY_CACHE: Dict[Tuple[str, str], Any] = {}
+_QUERY_CACHE_LOCK = threading.Lock()
+
+
+def _compile_query(language: str, query_scm: str, language_obj: Any = None) -> Any:
+    """Compile a tree-sitter query, handling old and new tree-sitter APIs"""
+    import tree_sitter
+    
+    if language_obj is None:
+        from tree_sitter_language_pack import get_language
+        language_obj = get_language(language)
+    
+    try:
+        return tree_sitter.Query(language_obj, query_scm)
+    except AttributeError:
+        # Fallback for older versions
+        return language_obj.query(query_scm)
+
+
+def get_compiled_query(language: str, query_scm: str, language_obj: Any = None) -> Any:
+    """
+    Get a compiled tree-sitter Query, compiling it on first use
+    
+    Args:
+        language: Language name (e.g., 'java')
+        query_scm: S-expression query string
+        language_obj: Optional tree-sitter Language; loaded from
+            tree-sitter-language-pack if omitted
+    
+    Returns:
+        Compiled tree-sitter Query shared by all callers in this process
+    """
+    key = (language, query_scm)
+    compiled = _QUERY_CACHE.get(key)
+    if compiled is None:
+        # Compile without the lock so other languages aren't held up; if two
+        # threads race on the same query, the first result stored wins
+        try:
+            compiled = _compile_query(language, query_scm, language_obj)
+        except Exception as e:
+            compiled = e
+        with _QUERY_CACHE_LOCK:
+            compiled = _QUERY_CACHE.setdefault(key, compiled)
+    
+    if isinstance(compiled, Exception):
+        raise compiled.with_traceback(None)
+    return compiled
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read a positive integer setting from the environment"""
+    try:
+        value = int(os.environ[name])
+    except KeyError:
+        return default
+    except ValueError:
+        raise ValueError(f"{name} must be an integer, got {os.environ[name]!r}") from None
+    if value <= 0:
+        raise ValueError(f"{name} must be positive, got {value}")
+    return value
+
+
+def _ft(extensions: Iterable[str], language: str, parser_type: str,
+        description: str = "", query_scm: Optional[str] = None) -> FileTypeConfig:
+    """
+    Build a FileTypeConfig with normalized extensions
+    
+    Extensions are lowercased and deduplicated; literal filenames
+    (Dockerfile, Makefile, ...) keep their case.
+    """
+    normalized = tuple(dict.fromkeys(
+        ext.lower() if ext.startswith('.') else ext for ext in extensions
+    ))
+    return FileTypeConfig(normalized, language, parser_type, description, query_scm=query_scm)
+
+
+# Tree-sitter queries, keyed by language
+_RAW_QUERIES = {
+    # C/C++ family
+    'cpp': """(class_specifier) @class (function_definition) @function (namespace_definition) @namespace""",
+    'c': """(function_definition) @function (struct_specifier) @struct""",
+    
+    # JVM/Object-Oriented
+    'java': """(class_declaration) @class (interface_declaration) @interface (enum_declaration) @enum (method_declaration) @method""",
+    'kotlin': """(class_declaration) @class (function_declaration) @function""",
+    'scala': """(class_definition) @class (function_definition) @function (object_definition) @object""",
+    'groovy': """(class_declaration) @class (method_declaration) @method""",
+    'clojure': """(list_lit) @list (defn) @function""",
+    
+    # Systems Programming
+    'go': """(function_declaration) @function (method_declaration) @method (type_declaration) @struct""",
+    'rust': """(function_item) @function (impl_item) @impl (struct_item) @struct (enum_item) @enum (trait_item) @trait""",
+    'zig': """(FnProto) @function (VarDecl) @variable""",
+    'nim': """(proc_declaration) @function (type_section) @type""",
+    'd': """(class_declaration) @class (function_declaration) @function""",
+    'v': """(function_declaration) @function (struct_declaration) @struct""",
+    'odin': """(procedure_declaration) @function (struct_declaration) @struct""",
+    'cuda': """(function_definition) @function (kernel_call) @kernel""",
+    'fortran': """(subroutine) @subroutine (function) @function (module) @module""",
+    'asm': """(instruction) @instruction (label) @label""",
+    'carbon': """(function_declaration) @function (class_declaration) @class""",
+    
+    # .NET
+    'csharp': """(class_declaration) @class (interface_declaration) @interface (enum_declaration) @enum (method_declaration) @method (namespace_declaration) @namespace""",
+    'fsharp': """(value_declaration) @function (type_definition) @type (module_defn) @module""",
+    
+    # Dynamic/Scripting
+    'python': """(class_definition) @class (function_definition) @function""",
+    'ruby': """(class) @class (module) @module (method) @method""",
+    'php': """(class_declaration) @class (function_definition) @function (method_declaration) @method (trait_declaration) @trait""",
+    'lua': """(function_definition) @function (assignment_statement) @assignment""",
+    'perl': """(subroutine_declaration_statement) @function (package_statement) @package""",
+    'elixir': """(call) @function (defmodule) @module""",
+    'erlang': """(function_clause) @function (module_attribute) @module""",
+    'dart': """(class_definition) @class (function_signature) @function""",
+    'actionscript': """(class_definition) @class (function_definition) @function""",
+    
+    # Shell/Scripting
+    'bash': """(function_definition) @function (command) @command""",
+    'fish': """(function_definition) @function (command) @command""",
+    'powershell': """(function_statement) @function (command_expression) @command""",
+    'tcl': """(proc) @function (command) @command""",
+    
+    # Functional Languages
+    'haskell': """(function) @function (type_signature) @signature""",
+    'ocaml': """(value_definition) @function (type_definition) @type""",
+    'swift': """(class_declaration) @class (function_declaration) @function (protocol_declaration) @protocol""",
+    'elm': """(value_declaration) @function (type_declaration) @type""",
+    'purescript': """(value_declaration) @function (type_declaration) @type""",
+    'racket': """(definition) @function (struct_definition) @struct""",
+    'scheme': """(definition) @function (lambda) @lambda""",
+    'commonlisp': """(defun) @function (defclass) @class""",
+    'reasonml': """(value_declaration) @function (type_declaration) @type""",
+    'agda': """(function_definition) @function (data_definition) @data""",
+    
+    # Web/JS Ecosystem
+    'javascript': """(class_declaration) @class (function_declaration) @function (method_definition) @method""",
+    'typescript': """(class_declaration) @class (interface_declaration) @interface (function_declaration) @function (method_definition) @method""",
+    'tsx': """(class_declaration) @class (function_declaration) @function (jsx_element) @component""",
+    'html': """(script_element) @script (style_element) @style (element) @element""",
+    'css': """(rule_set) @rule (declaration) @declaration""",
+    'vue': """(script_element) @script (template_element) @template (style_element) @style""",
+    'svelte': """(script_element) @script (style_element) @style (element) @element""",
+    'astro': """(component) @component (frontmatter) @frontmatter""",
+    
+    # Data Formats
+    'json': """(pair) @pair (object) @object (array) @array""",
+    'yaml': """(block_mapping_pair) @pair (block_sequence) @sequence""",
+    'toml': """(table) @table (pair) @pair""",
+    'xml': """(element) @element (attribute) @attribute""",
+    'csv': """(row) @row (field) @field""",
+    'ini': """(section) @section (property) @property""",
+    'properties': """(property) @property (comment) @comment""",
+    
+    # Query/API Languages
+    'sql': """(select_statement) @select (create_statement) @create (function_definition) @function""",
+    'graphql': """(operation_definition) @operation (field) @field (fragment_definition) @fragment""",
+    
+    # Protocol/IDL
+    'protobuf': """(message) @message (service) @service (rpc) @rpc""",
+    'thrift': """(struct) @struct (service) @service (function) @function""",
+    'capnp': """(struct_def) @struct (interface_def) @interface""",
+    
+    # Build/Config/Infrastructure
+    'dockerfile': """(from_instruction) @from (run_instruction) @run""",
+    'terraform': """(block) @resource (attribute) @attribute""",
+    'hcl': """(block) @block (attribute) @attribute""",
+    'cmake': """(function_call) @function (macro_definition) @macro""",
+    'make': """(rule) @rule (variable_assignment) @variable""",
+    'ninja': """(rule) @rule (build) @build""",
+    'bazel': """(call) @rule (assignment) @variable""",
+    'bitbake': """(function_definition) @function (assignment) @variable""",
+    
+    # Documentation
+    'markdown': """(atx_heading) @heading (fenced_code_block) @code (link_definition) @link""",
+    'rst': """(section) @section (directive) @directive""",
+    'latex': """(generic_command) @command (generic_environment) @environment""",
+    'org': """(headline) @heading (block) @block""",
+    'bibtex': """(entry) @entry (field) @field""",
+    'pod': """(command) @command (paragraph) @paragraph""",
+    
+    # Scientific/Data
+    'r': """(function_definition) @function (binary_operator) @operator""",
+    'julia': """(function_definition) @function (struct_definition) @struct""",
+    'matlab': """(function_definition) @function (assignment) @assignment""",
+    'scilab': """(function_definition) @function (assignment) @assignment""",
+    
+    # Hardware Description
+    'verilog': """(module_declaration) @module (function_declaration) @function""",
+    'vhdl': """(entity_declaration) @entity (architecture_body) @architecture""",
+    'systemverilog': """(module_declaration) @module (class_declaration) @class""",
+    
+    # Blockchain/Smart Contracts
+    'solidity': """(contract_declaration) @contract (function_definition) @function""",
+    'cairo': """ (function_definition) @function (struct_definition) @struct""",
+    'clarity': """(define_function) @function (define_public) @public""",
+    
+    # Mobile/Embedded
+    'apex': """(class_declaration) @class (method_declaration) @method""",
+    'arduino': """(function_definition) @function (compound_statement) @block""",
+    
+    # Accounting/Finance
+    'beancount': """(transaction) @transaction (account) @account""",
+    'ledger': """(transaction) @transaction (posting) @posting""",
+    
+    # Other Domain-Specific
+    'ada': """(subprogram_declaration) @function (package_declaration) @package""",
+    'bicep': """(resource_declaration) @resource (output_declaration) @output""",
+    'chatito': """(entity_definition) @entity (intent_definition) @intent""",
+    'devicetree': """(node) @node (property) @property""",
+    'dot': """(graph) @graph (node_stmt) @node (edge_stmt) @edge""",
+    'git_config': """(section) @section (variable) @variable""",
+    'git_rebase': """(command) @command (label) @label""",
+    'gitattributes': """(pattern) @pattern (attribute) @attribute""",
+    'gitignore': """(pattern) @pattern (comment) @comment""",
+    'gpg': """(command) @command (argument) @argument""",
+    'http': """(request) @request (header) @header""",
+    'ini': """(section) @section (property) @property""",
+    'just': """(recipe) @recipe (dependency) @dependency""",
+    'kdl': """(node) @node (property) @property""",
+    'meson': """(function_call) @function (assignment) @variable""",
+    'nix': """(function) @function (binding) @binding""",
+    'passwd': """(entry) @entry (field) @field""",
+    'smithy': """(shape) @shape (trait) @trait""",
+    'starlark': """(function_definition) @function (assignment) @assignment""",
+    'textproto': """(message) @message (field) @field""",
+    'todotxt': """(task) @task (priority) @priority""",
+    'tsv': """(row) @row (field) @field""",
+    'udev': """(rule) @rule (assignment) @assignment""",
+    'urll': """(url) @url (query) @query""",
+    'requirements': """(requirement) @package (specifier) @version""",
+}
+
+# Whitespace-normalized and interned once at import, so every Config (and
+# FileTypeConfig.query_scm) shares the same compact string objects
+_QUERIES = {lang: sys.intern(' '.join(query.split())) for lang, query in _RAW_QUERIES.items()}
+
+# Directories to exclude from indexing
+_EXCLUDE_DIRS = frozenset({
+    'third_party', 'out', 'build', '.git', '.svn', '.hg',
+    '__pycache__', 'node_modules', 'venv', 'env',
+    'test', 'tests', 'testing'
+})
+
+
+# File type table: (name, extensions, language, parser_type, description, query_key)
+# query_key selects the tree-sitter query from _QUERIES (None for no query)
+_FILE_TYPE_TABLE: List[Tuple[str, Tuple[str, ...], str, str, str, Optional[str]]] = [
+    ('cpp', ('.cc', '.cpp', '.h', '.hpp', '.c', '.cxx', '.m', '.mm'), 'cpp', 'treesitter', 'C/C++/Obj-C source and header files', None),
+    ('python', ('.py',), 'python', 'treesitter', 'Python source files', None),
+    ('javascript', ('.js', '.ts', '.jsx', '.tsx'), 'javascript', 'treesitter', 'JavaScript/TypeScript files', None),
+    ('mojom', ('.mojom', '.mojo'), 'mojom', 'regex', 'Mojo interface definition files', None),
+    ('gn', ('.gn', '.gni'), 'gn', 'regex', 'GN build system files', None),
+
+    # JVM Languages
+    ('java', ('.java',), 'java', 'treesitter', 'Java source', 'java'),
+    ('kotlin', ('.kt', '.kts'), 'kotlin', 'treesitter', 'Kotlin source', 'kotlin'),
+    ('scala', ('.scala',), 'scala', 'treesitter', 'Scala source', 'scala'),
+    ('groovy', ('.groovy', '.gradle'), 'groovy', 'treesitter', 'Groovy source', 'groovy'),
+    ('clojure', ('.clj', '.cljs', '.cljc'), 'clojure', 'treesitter', 'Clojure source', 'clojure'),
+
+    # Systems Programming
+    ('go', ('.go',), 'go', 'treesitter', 'Go source', 'go'),
+    ('rust', ('.rs',), 'rust', 'treesitter', 'Rust source', 'rust'),
+    ('zig', ('.zig',), 'zig', 'treesitter', 'Zig source', 'zig'),
+    ('nim', ('.nim',), 'nim', 'treesitter', 'Nim source', 'nim'),
+    ('d', ('.d',), 'd', 'treesitter', 'D source', 'd'),
+    ('v', ('.v',), 'v', 'treesitter', 'V source', 'v'),
+    ('odin', ('.odin',), 'odin', 'treesitter', 'Odin source', 'odin'),
+    ('cuda', ('.cu', '.cuh'), 'cuda', 'treesitter', 'CUDA source', 'cuda'),
+    ('fortran', ('.f', '.f90', '.f95'), 'fortran', 'treesitter', 'Fortran source', 'fortran'),
+    ('asm', ('.asm', '.s'), 'asm', 'treesitter', 'Assembly source', 'asm'),
+    ('ada', ('.adb', '.ads'), 'ada', 'treesitter', 'Ada source', 'ada'),
+
+    # Dynamic Languages
+    ('ruby', ('.rb',), 'ruby', 'treesitter', 'Ruby source', 'ruby'),
+    ('php', ('.php',), 'php', 'treesitter', 'PHP source', 'php'),
+    ('lua', ('.lua',), 'lua', 'treesitter', 'Lua source', 'lua'),
+    ('perl', ('.pl', '.pm'), 'perl', 'treesitter', 'Perl source', 'perl'),
+    ('elixir', ('.ex', '.exs'), 'elixir', 'treesitter', 'Elixir source', 'elixir'),
+    ('erlang', ('.erl', '.hrl'), 'erlang', 'treesitter', 'Erlang source', 'erlang'),
+    ('dart', ('.dart',), 'dart', 'treesitter', 'Dart source', 'dart'),
+
+    # .NET
+    ('csharp', ('.cs',), 'csharp', 'treesitter', 'C# source', 'csharp'),
+    ('fsharp', ('.fs', '.fsx', '.fsi'), 'fsharp', 'treesitter', 'F# source', 'fsharp'),
+
+    # Web/JS Languages
+    ('html', ('.html', '.htm'), 'html', 'treesitter', 'HTML files', 'html'),
+    ('css', ('.css', '.scss', '.sass', '.less'), 'css', 'treesitter', 'CSS files', 'css'),
+    ('typescript', ('.ts',), 'typescript', 'treesitter', 'TypeScript files', 'typescript'),
+    ('tsx', ('.tsx',), 'tsx', 'treesitter', 'TSX files', 'tsx'),
+    ('vue', ('.vue',), 'vue', 'treesitter', 'Vue files', 'vue'),
+    ('svelte', ('.svelte',), 'svelte', 'treesitter', 'Svelte files', 'svelte'),
+    ('astro', ('.astro',), 'astro', 'treesitter', 'Astro files', 'astro'),
+
+    # Data/Config
+    ('json', ('.json',), 'json', 'treesitter', 'JSON files', 'json'),
+    ('yaml', ('.yaml', '.yml'), 'yaml', 'treesitter', 'YAML files', 'yaml'),
+    ('toml', ('.toml',), 'toml', 'treesitter', 'TOML files', 'toml'),
+    ('xml', ('.xml',), 'xml', 'treesitter', 'XML files', 'xml'),
+    ('graphql', ('.graphql', '.gql'), 'graphql', 'treesitter', 'GraphQL files', 'graphql'),
+    ('csv', ('.csv',), 'csv', 'treesitter', 'CSV files', 'csv'),
+
+    # Query/Protocols
+    ('sql', ('.sql',), 'sql', 'treesitter', 'SQL files', 'sql'),
+    ('protobuf', ('.proto',), 'protobuf', 'treesitter', 'Protocol Buffer files', 'protobuf'),
+    ('thrift', ('.thrift',), 'thrift', 'treesitter', 'Thrift files', 'thrift'),
+    ('capnp', ('.capnp',), 'capnp', 'treesitter', 'Cap n Proto files', 'capnp'),
+
+    # Scripts/Build/Config
+    ('bash', ('.sh', '.bash'), 'bash', 'treesitter', 'Shell scripts', 'bash'),
+    ('dockerfile', ('Dockerfile', '.dockerfile'), 'dockerfile', 'treesitter', 'Docker files', 'dockerfile'),
+    ('terraform', ('.tf', '.tfvars'), 'terraform', 'treesitter', 'Terraform files', 'terraform'),
+    ('hcl', ('.hcl',), 'hcl', 'treesitter', 'HCL files', 'hcl'),
+    ('cmake', ('CMakeLists.txt', '.cmake'), 'cmake', 'treesitter', 'CMake files', 'cmake'),
+    ('make', ('Makefile', '.mk'), 'make', 'treesitter', 'Makefiles', 'make'),
+    ('ninja', ('.ninja',), 'ninja', 'treesitter', 'Ninja build files', 'ninja'),
+    ('bazel', ('BUILD', 'WORKSPACE', '.bazel', '.bzl'), 'bazel', 'treesitter', 'Bazel build files', 'bazel'),
+    ('fish', ('.fish',), 'fish', 'treesitter', 'Fish shell scripts', 'fish'),
+    ('powershell', ('.ps1', '.psm1', '.psd1'), 'powershell', 'treesitter', 'PowerShell scripts', 'powershell'),
+    ('tcl', ('.tcl',), 'tcl', 'treesitter', 'Tcl scripts', 'tcl'),
+
+    ('haskell', ('.hs',), 'haskell', 'treesitter', 'Haskell source', 'haskell'),
+    ('ocaml', ('.ml', '.mli'), 'ocaml', 'treesitter', 'OCaml source', 'ocaml'),
+    ('swift', ('.swift',), 'swift', 'treesitter', 'Swift source', 'swift'),
+    ('elm', ('.elm',), 'elm', 'treesitter', 'Elm source', 'elm'),
+    ('purescript', ('.purs',), 'purescript', 'treesitter', 'PureScript source', 'purescript'),
+    ('racket', ('.rkt',), 'racket', 'treesitter', 'Racket source', 'racket'),
+    ('scheme', ('.scm', '.ss'), 'scheme', 'treesitter', 'Scheme source', 'scheme'),
+    ('commonlisp', ('.lisp', '.cl'), 'commonlisp', 'treesitter', 'Common Lisp source', 'commonlisp'),
+    ('reasonml', ('.re', '.rei'), 'reasonml', 'treesitter', 'ReasonML source', 'reasonml'),
+
+    ('markdown', ('.md', '.markdown'), 'markdown', 'treesitter', 'Markdown files', 'markdown'),
+    ('rst', ('.rst',), 'rst', 'treesitter', 'reStructuredText files', 'rst'),
+    ('latex', ('.tex',), 'latex', 'treesitter', 'LaTeX files', 'latex'),
+    ('org', ('.org',), 'org', 'treesitter', 'Org-mode files', 'org'),
+
+    ('r', ('.r', '.R'), 'r', 'treesitter', 'R source', 'r'),
+    ('julia', ('.jl',), 'julia', 'treesitter', 'Julia source', 'julia'),
+    ('matlab', ('.m',), 'matlab', 'treesitter', 'MATLAB source', 'matlab'),
+
+    # Hardware Description
+    ('verilog', ('.v', '.vh'), 'verilog', 'treesitter', 'Verilog source', 'verilog'),
+    ('vhdl', ('.vhd', '.vhdl'), 'vhdl', 'treesitter', 'VHDL source', 'vhdl'),
+
+    # Blockchain/Smart Contracts
+    ('solidity', ('.sol',), 'solidity', 'treesitter', 'Solidity files', 'solidity'),
+]
+
+
+# Preferred languages when several file types claim the same extension
+# (e.g. '.ts' is listed under both javascript and typescript). Languages
+# not listed here keep _FILE_TYPE_TABLE order.
+_LANG_PRIORITY: Tuple[str, ...] = ('typescript', 'tsx')
+
+
+def _language_rank(language: str) -> int:
+    """Sort key placing _LANG_PRIORITY languages first (stable otherwise)"""
+    try:
+        return _LANG_PRIORITY.index(language)
+    except ValueError:
+        return len(_LANG_PRIORITY)
+
+
 class Config:
     """Main configuration for Chrome RAG System"""
     
@@ -27,325 +408,143 @@ class Config:
         # Database settings
         self.db_path = "./chrome_rag_db"
         self.collection_name = "chrome_code"
-        self.batch_size = 100
+        self.batch_size = _env_int('CRAG_BATCH_SIZE', 100)
+        
+        # Content-addressed cache of parse results, stored inside the active
+        # db_path (None disables it)
+        self.ast_cache_name = "ast_cache.sqlite"
         
         # Logging settings
         self.log_dir = "./logs"
         self.log_level = "INFO"
         
-        # Tree-sitter Queries
-        self.QUERIES = {
-            # C/C++ family
-            'cpp': """(class_specifier) @class (function_definition) @function (namespace_definition) @namespace""",
-            'c': """(function_definition) @function (struct_specifier) @struct""",
-            
-            # JVM/Object-Oriented
-            'java': """(class_declaration) @class (interface_declaration) @interface (enum_declaration) @enum (method_declaration) @method""",
-            'kotlin': """(class_declaration) @class (function_declaration) @function""",
-            'scala': """(class_definition) @class (function_definition) @function (object_definition) @object""",
-            'groovy': """(class_declaration) @class (method_declaration) @method""",
-            'clojure': """(list_lit) @list (defn) @function""",
-            
-            # Systems Programming
-            'go': """(function_declaration) @function (method_declaration) @method (type_declaration) @struct""",
-            'rust': """(function_item) @function (impl_item) @impl (struct_item) @struct (enum_item) @enum (trait_item) @trait""",
-            'zig': """(FnProto) @function (VarDecl) @variable""",
-            'nim': """(proc_declaration) @function (type_section) @type""",
-            'd': """(class_declaration) @class (function_declaration) @function""",
-            'v': """(function_declaration) @function (struct_declaration) @struct""",
-            'odin': """(procedure_declaration) @function (struct_declaration) @struct""",
-            'cuda': """(function_definition) @function (kernel_call) @kernel""",
-            'fortran': """(subroutine) @subroutine (function) @function (module) @module""",
-            'asm': """(instruction) @instruction (label) @label""",
-            'carbon': """(function_declaration) @function (class_declaration) @class""",
-            
-            # .NET
-            'csharp': """(class_declaration) @class (interface_declaration) @interface (enum_declaration) @enum (method_declaration) @method (namespace_declaration) @namespace""",
-            'fsharp': """(value_declaration) @function (type_definition) @type (module_defn) @module""",
-            
-            # Dynamic/Scripting
-            'python': """(class_definition) @class (function_definition) @function""",
-            'ruby': """(class) @class (module) @module (method) @method""",
-            'php': """(class_declaration) @class (function_definition) @function (method_declaration) @method (trait_declaration) @trait""",
-            'lua': """(function_definition) @function (assignment_statement) @assignment""",
-            'perl': """(subroutine_declaration_statement) @function (package_statement) @package""",
-            'elixir': """(call) @function (defmodule) @module""",
-            'erlang': """(function_clause) @function (module_attribute) @module""",
-            'dart': """(class_definition) @class (function_signature) @function""",
-            'actionscript': """(class_definition) @class (function_definition) @function""",
-            
-            # Shell/Scripting
-            'bash': """(function_definition) @function (command) @command""",
-            'fish': """(function_definition) @function (command) @command""",
-            'powershell': """(function_statement) @function (command_expression) @command""",
-            'tcl': """(proc) @function (command) @command""",
-            
-            # Functional Languages
-            'haskell': """(function) @function (type_signature) @signature""",
-            'ocaml': """(value_definition) @function (type_definition) @type""",
-            'swift': """(class_declaration) @class (function_declaration) @function (protocol_declaration) @protocol""",
-            'elm': """(value_declaration) @function (type_declaration) @type""",
-            'purescript': """(value_declaration) @function (type_declaration) @type""",
-            'racket': """(definition) @function (struct_definition) @struct""",
-            'scheme': """(definition) @function (lambda) @lambda""",
-            'commonlisp': """(defun) @function (defclass) @class""",
-            'reasonml': """(value_declaration) @function (type_declaration) @type""",
-            'agda': """(function_definition) @function (data_definition) @data""",
-            
-            # Web/JS Ecosystem
-            'javascript': """(class_declaration) @class (function_declaration) @function (method_definition) @method""",
-            'typescript': """(class_declaration) @class (interface_declaration) @interface (function_declaration) @function (method_definition) @method""",
-            'tsx': """(class_declaration) @class (function_declaration) @function (jsx_element) @component""",
-            'html': """(script_element) @script (style_element) @style (element) @element""",
-            'css': """(rule_set) @rule (declaration) @declaration""",
-            'vue': """(script_element) @script (template_element) @template (style_element) @style""",
-            'svelte': """(script_element) @script (style_element) @style (element) @element""",
-            'astro': """(component) @component (frontmatter) @frontmatter""",
-            
-            # Data Formats
-            'json': """(pair) @pair (object) @object (array) @array""",
-            'yaml': """(block_mapping_pair) @pair (block_sequence) @sequence""",
-            'toml': """(table) @table (pair) @pair""",
-            'xml': """(element) @element (attribute) @attribute""",
-            'csv': """(row) @row (field) @field""",
-            'ini': """(section) @section (property) @property""",
-            'properties': """(property) @property (comment) @comment""",
-            
-            # Query/API Languages
-            'sql': """(select_statement) @select (create_statement) @create (function_definition) @function""",
-            'graphql': """(operation_definition) @operation (field) @field (fragment_definition) @fragment""",
-            
-            # Protocol/IDL
-            'protobuf': """(message) @message (service) @service (rpc) @rpc""",
-            'thrift': """(struct) @struct (service) @service (function) @function""",
-            'capnp': """(struct_def) @struct (interface_def) @interface""",
-            
-            # Build/Config/Infrastructure
-            'dockerfile': """(from_instruction) @from (run_instruction) @run""",
-            'terraform': """(block) @resource (attribute) @attribute""",
-            'hcl': """(block) @block (attribute) @attribute""",
-            'cmake': """(function_call) @function (macro_definition) @macro""",
-            'make': """(rule) @rule (variable_assignment) @variable""",
-            'ninja': """(rule) @rule (build) @build""",
-            'bazel': """(call) @rule (assignment) @variable""",
-            'bitbake': """(function_definition) @function (assignment) @variable""",
-            
-            # Documentation
-            'markdown': """(atx_heading) @heading (fenced_code_block) @code (link_definition) @link""",
-            'rst': """(section) @section (directive) @directive""",
-            'latex': """(generic_command) @command (generic_environment) @environment""",
-            'org': """(headline) @heading (block) @block""",
-            'bibtex': """(entry) @entry (field) @field""",
-            'pod': """(command) @command (paragraph) @paragraph""",
-            
-            # Scientific/Data
-            'r': """(function_definition) @function (binary_operator) @operator""",
-            'julia': """(function_definition) @function (struct_definition) @struct""",
-            'matlab': """(function_definition) @function (assignment) @assignment""",
-            'scilab': """(function_definition) @function (assignment) @assignment""",
-            
-            # Hardware Description
-            'verilog': """(module_declaration) @module (function_declaration) @function""",
-            'vhdl': """(entity_declaration) @entity (architecture_body) @architecture""",
-            'systemverilog': """(module_declaration) @module (class_declaration) @class""",
-            
-            # Blockchain/Smart Contracts
-            'solidity': """(contract_declaration) @contract (function_definition) @function""",
-            'cairo': """ (function_definition) @function (struct_definition) @struct""",
-            'clarity': """(define_function) @function (define_public) @public""",
-            
-            # Mobile/Embedded
-            'apex': """(class_declaration) @class (method_declaration) @method""",
-            'arduino': """(function_definition) @function (compound_statement) @block""",
-            
-            # Accounting/Finance
-            'beancount': """(transaction) @transaction (account) @account""",
-            'ledger': """(transaction) @transaction (posting) @posting""",
-            
-            # Other Domain-Specific
-            'ada': """(subprogram_declaration) @function (package_declaration) @package""",
-            'bicep': """(resource_declaration) @resource (output_declaration) @output""",
-            'chatito': """(entity_definition) @entity (intent_definition) @intent""",
-            'devicetree': """(node) @node (property) @property""",
-            'dot': """(graph) @graph (node_stmt) @node (edge_stmt) @edge""",
-            'git_config': """(section) @section (variable) @variable""",
-            'git_rebase': """(command) @command (label) @label""",
-            'gitattributes': """(pattern) @pattern (attribute) @attribute""",
-            'gitignore': """(pattern) @pattern (comment) @comment""",
-            'gpg': """(command) @command (argument) @argument""",
-            'http': """(request) @request (header) @header""",
-            'ini': """(section) @section (property) @property""",
-            'just': """(recipe) @recipe (dependency) @dependency""",
-            'kdl': """(node) @node (property) @property""",
-            'meson': """(function_call) @function (assignment) @variable""",
-            'nix': """(function) @function (binding) @binding""",
-            'passwd': """(entry) @entry (field) @field""",
-            'smithy': """(shape) @shape (trait) @trait""",
-            'starlark': """(function_definition) @function (assignment) @assignment""",
-            'textproto': """(message) @message (field) @field""",
-            'todotxt': """(task) @task (priority) @priority""",
-            'tsv': """(row) @row (field) @field""",
-            'udev': """(rule) @rule (assignment) @assignment""",
-            'urll': """(url) @url (query) @query""",
-            'requirements': """(requirement) @package (specifier) @version""",
-        }
+        # Tree-sitter Queries (read-only view of the shared table)
+        self.QUERIES: Mapping[str, str] = types.MappingProxyType(_QUERIES)
         
         # File type configurations
-        self.file_types = {
-            'cpp': FileTypeConfig(
-                extensions=['.cc', '.cpp', '.h', '.hpp', '.c', '.cxx', '.m', '.mm'],
-                language='cpp',
-                parser_type='treesitter',
-                description='C/C++/Obj-C source and header files'
-            ),
-            'python': FileTypeConfig(
-                extensions=['.py'],
-                language='python',
-                parser_type='treesitter',
-                description='Python source files'
-            ),
-            'javascript': FileTypeConfig(
-                extensions=['.js', '.ts', '.jsx', '.tsx'],
-                language='javascript',
-                parser_type='treesitter',
-                description='JavaScript/TypeScript files'
-            ),
-            'mojom': FileTypeConfig(
-                extensions=['.mojom', '.mojo'],
-                language='mojom',
-                parser_type='regex',
-                description='Mojo interface definition files'
-            ),
-            'gn': FileTypeConfig(
-                extensions=['.gn', '.gni'],
-                language='gn',
-                parser_type='regex',
-                description='GN build system files'
-            ),
-            
-            # JVM Languages
-            'java': FileTypeConfig(['.java'], 'java', 'treesitter', 'Java source', query_scm=self.QUERIES['java']),
-            'kotlin': FileTypeConfig(['.kt', '.kts'], 'kotlin', 'treesitter', 'Kotlin source', query_scm=self.QUERIES.get('kotlin')),
-            'scala': FileTypeConfig(['.scala'], 'scala', 'treesitter', 'Scala source', query_scm=self.QUERIES.get('scala')),
-            'groovy': FileTypeConfig(['.groovy', '.gradle'], 'groovy', 'treesitter', 'Groovy source', query_scm=self.QUERIES.get('groovy')),
-            'clojure': FileTypeConfig(['.clj', '.cljs', '.cljc'], 'clojure', 'treesitter', 'Clojure source', query_scm=self.QUERIES.get('clojure')),
-            
-            # Systems Programming
-            'go': FileTypeConfig(['.go'], 'go', 'treesitter', 'Go source', query_scm=self.QUERIES['go']),
-            'rust': FileTypeConfig(['.rs'], 'rust', 'treesitter', 'Rust source', query_scm=self.QUERIES['rust']),
-            'zig': FileTypeConfig(['.zig'], 'zig', 'treesitter', 'Zig source', query_scm=self.QUERIES.get('zig')),
-            'nim': FileTypeConfig(['.nim'], 'nim', 'treesitter', 'Nim source', query_scm=self.QUERIES.get('nim')),
-            'd': FileTypeConfig(['.d'], 'd', 'treesitter', 'D source', query_scm=self.QUERIES.get('d')),
-            'v': FileTypeConfig(['.v'], 'v', 'treesitter', 'V source', query_scm=self.QUERIES.get('v')),
-            'odin': FileTypeConfig(['.odin'], 'odin', 'treesitter', 'Odin source', query_scm=self.QUERIES.get('odin')),
-            'cuda': FileTypeConfig(['.cu', '.cuh'], 'cuda', 'treesitter', 'CUDA source', query_scm=self.QUERIES.get('cuda')),
-            'fortran': FileTypeConfig(['.f', '.f90', '.f95'], 'fortran', 'treesitter', 'Fortran source', query_scm=self.QUERIES.get('fortran')),
-            'asm': FileTypeConfig(['.asm', '.s'], 'asm', 'treesitter', 'Assembly source', query_scm=self.QUERIES.get('asm')),
-            'ada': FileTypeConfig(['.adb', '.ads'], 'ada', 'treesitter', 'Ada source', query_scm=self.QUERIES.get('ada')),
-            
-            # Dynamic Languages
-            'ruby': FileTypeConfig(['.rb'], 'ruby', 'treesitter', 'Ruby source', query_scm=self.QUERIES['ruby']),
-            'php': FileTypeConfig(['.php'], 'php', 'treesitter', 'PHP source', query_scm=self.QUERIES['php']),
-            'lua': FileTypeConfig(['.lua'], 'lua', 'treesitter', 'Lua source', query_scm=self.QUERIES.get('lua')),
-            'perl': FileTypeConfig(['.pl', '.pm'], 'perl', 'treesitter', 'Perl source', query_scm=self.QUERIES.get('perl')),
-            'elixir': FileTypeConfig(['.ex', '.exs'], 'elixir', 'treesitter', 'Elixir source', query_scm=self.QUERIES.get('elixir')),
-            'erlang': FileTypeConfig(['.erl', '.hrl'], 'erlang', 'treesitter', 'Erlang source', query_scm=self.QUERIES.get('erlang')),
-            'dart': FileTypeConfig(['.dart'], 'dart', 'treesitter', 'Dart source', query_scm=self.QUERIES.get('dart')),
-            
-            # .NET
-            'csharp': FileTypeConfig(['.cs'], 'csharp', 'treesitter', 'C# source', query_scm=self.QUERIES['csharp']),
-            'fsharp': FileTypeConfig(['.fs', '.fsx', '.fsi'], 'fsharp', 'treesitter', 'F# source', query_scm=self.QUERIES.get('fsharp')),
-            
-            # Web/JS Languages
-            'html': FileTypeConfig(['.html', '.htm'], 'html', 'treesitter', 'HTML files', query_scm=self.QUERIES.get('html')),
-            'css': FileTypeConfig(['.css', '.scss', '.sass', '.less'], 'css', 'treesitter', 'CSS files', query_scm=self.QUERIES.get('css')),
-            'typescript': FileTypeConfig(['.ts'], 'typescript', 'treesitter', 'TypeScript files', query_scm=self.QUERIES.get('typescript')),
-            'tsx': FileTypeConfig(['.tsx'], 'tsx', 'treesitter', 'TSX files', query_scm=self.QUERIES.get('tsx')),
-            'vue': FileTypeConfig(['.vue'], 'vue', 'treesitter', 'Vue files', query_scm=self.QUERIES.get('vue')),
-            'svelte': FileTypeConfig(['.svelte'], 'svelte', 'treesitter', 'Svelte files', query_scm=self.QUERIES.get('svelte')),
-            'astro': FileTypeConfig(['.astro'], 'astro', 'treesitter', 'Astro files', query_scm=self.QUERIES.get('astro')),
-            
-            # Data/Config
-            'json': FileTypeConfig(['.json'], 'json', 'treesitter', 'JSON files', query_scm=self.QUERIES.get('json')),
-            'yaml': FileTypeConfig(['.yaml', '.yml'], 'yaml', 'treesitter', 'YAML files', query_scm=self.QUERIES.get('yaml')),
-            'toml': FileTypeConfig(['.toml'], 'toml', 'treesitter', 'TOML files', query_scm=self.QUERIES.get('toml')),
-            'xml': FileTypeConfig(['.xml'], 'xml', 'treesitter', 'XML files', query_scm=self.QUERIES.get('xml')),
-            'graphql': FileTypeConfig(['.graphql', '.gql'], 'graphql', 'treesitter', 'GraphQL files', query_scm=self.QUERIES.get('graphql')),
-            'csv': FileTypeConfig(['.csv'], 'csv', 'treesitter', 'CSV files', query_scm=self.QUERIES.get('csv')),
-            
-            # Query/Protocols
-            'sql': FileTypeConfig(['.sql'], 'sql', 'treesitter', 'SQL files', query_scm=self.QUERIES.get('sql')),
-            'protobuf': FileTypeConfig(['.proto'], 'protobuf', 'treesitter', 'Protocol Buffer files', query_scm=self.QUERIES.get('protobuf')),
-            'thrift': FileTypeConfig(['.thrift'], 'thrift', 'treesitter', 'Thrift files', query_scm=self.QUERIES.get('thrift')),
-            'capnp': FileTypeConfig(['.capnp'], 'capnp', 'treesitter', 'Cap n Proto files', query_scm=self.QUERIES.get('capnp')),
-            
-            # Scripts/Build/Config
-            'bash': FileTypeConfig(['.sh', '.bash'], 'bash', 'treesitter', 'Shell scripts', query_scm=self.QUERIES.get('bash')),
-            'dockerfile': FileTypeConfig(['Dockerfile', '.dockerfile'], 'dockerfile', 'treesitter', 'Docker files', query_scm=self.QUERIES.get('dockerfile')),
-            'terraform': FileTypeConfig(['.tf', '.tfvars'], 'terraform', 'treesitter', 'Terraform files', query_scm=self.QUERIES.get('terraform')),
-            'hcl': FileTypeConfig(['.hcl'], 'hcl', 'treesitter', 'HCL files', query_scm=self.QUERIES.get('hcl')),
-            'cmake': FileTypeConfig(['CMakeLists.txt', '.cmake'], 'cmake', 'treesitter', 'CMake files', query_scm=self.QUERIES.get('cmake')),
-            'make': FileTypeConfig(['Makefile', '.mk'], 'make', 'treesitter', 'Makefiles', query_scm=self.QUERIES.get('make')),
-            'ninja': FileTypeConfig(['.ninja'], 'ninja', 'treesitter', 'Ninja build files', query_scm=self.QUERIES.get('ninja')),
-            'bazel': FileTypeConfig(['BUILD', 'WORKSPACE', '.bazel', '.bzl'], 'bazel', 'treesitter', 'Bazel build files', query_scm=self.QUERIES.get('bazel')),
-            'fish': FileTypeConfig(['.fish'], 'fish', 'treesitter', 'Fish shell scripts', query_scm=self.QUERIES.get('fish')),
-            'powershell': FileTypeConfig(['.ps1', '.psm1', '.psd1'], 'powershell', 'treesitter', 'PowerShell scripts', query_scm=self.QUERIES.get('powershell')),
-            'tcl': FileTypeConfig(['.tcl'], 'tcl', 'treesitter', 'Tcl scripts', query_scm=self.QUERIES.get('tcl')),
-            
-            'haskell': FileTypeConfig(['.hs'], 'haskell', 'treesitter', 'Haskell source', query_scm=self.QUERIES.get('haskell')),
-            'ocaml': FileTypeConfig(['.ml', '.mli'], 'ocaml', 'treesitter', 'OCaml source', query_scm=self.QUERIES.get('ocaml')),
-            'swift': FileTypeConfig(['.swift'], 'swift', 'treesitter', 'Swift source', query_scm=self.QUERIES.get('swift')),
-            'elm': FileTypeConfig(['.elm'], 'elm', 'treesitter', 'Elm source', query_scm=self.QUERIES.get('elm')),
-            'purescript': FileTypeConfig(['.purs'], 'purescript', 'treesitter', 'PureScript source', query_scm=self.QUERIES.get('purescript')),
-            'racket': FileTypeConfig(['.rkt'], 'racket', 'treesitter', 'Racket source', query_scm=self.QUERIES.get('racket')),
-            'scheme': FileTypeConfig(['.scm', '.ss'], 'scheme', 'treesitter', 'Scheme source', query_scm=self.QUERIES.get('scheme')),
-            'commonlisp': FileTypeConfig(['.lisp', '.cl'], 'commonlisp', 'treesitter', 'Common Lisp source', query_scm=self.QUERIES.get('commonlisp')),
-            'reasonml': FileTypeConfig(['.re', '.rei'], 'reasonml', 'treesitter', 'ReasonML source', query_scm=self.QUERIES.get('reasonml')),
-            
-            'markdown': FileTypeConfig(['.md', '.markdown'], 'markdown', 'treesitter', 'Markdown files', query_scm=self.QUERIES.get('markdown')),
-            'rst': FileTypeConfig(['.rst'], 'rst', 'treesitter', 'reStructuredText files', query_scm=self.QUERIES.get('rst')),
-            'latex': FileTypeConfig(['.tex'], 'latex', 'treesitter', 'LaTeX files', query_scm=self.QUERIES.get('latex')),
-            'org': FileTypeConfig(['.org'], 'org', 'treesitter', 'Org-mode files', query_scm=self.QUERIES.get('org')),
-            
-            'r': FileTypeConfig(['.r', '.R'], 'r', 'treesitter', 'R source', query_scm=self.QUERIES.get('r')),
-            'julia': FileTypeConfig(['.jl'], 'julia', 'treesitter', 'Julia source', query_scm=self.QUERIES.get('julia')),
-            'matlab': FileTypeConfig(['.m'], 'matlab', 'treesitter', 'MATLAB source', query_scm=self.QUERIES.get('matlab')),
-            
-            # Hardware Description
-            'verilog': FileTypeConfig(['.v', '.vh'], 'verilog', 'treesitter', 'Verilog source', query_scm=self.QUERIES.get('verilog')),
-            'vhdl': FileTypeConfig(['.vhd', '.vhdl'], 'vhdl', 'treesitter', 'VHDL source', query_scm=self.QUERIES.get('vhdl')),
-            
-            # Blockchain/Smart Contracts
-            'solidity': FileTypeConfig(['.sol'], 'solidity', 'treesitter', 'Solidity files', query_scm=self.QUERIES.get('solidity')),
+        self._file_types_raw = {
+            name: _ft(extensions, language, parser_type, description,
+                      query_scm=self.QUERIES.get(query_key) if query_key else None)
+            for name, extensions, language, parser_type, description, query_key in _FILE_TYPE_TABLE
         }
+        # Read-only view: safe to share across threads and forked workers
+        self.file_types: Mapping[str, FileTypeConfig] = types.MappingProxyType(self._file_types_raw)
+        
+        # Every language claiming each extension; the most preferred one wins:
+        # _LANG_PRIORITY entries lead, the rest keep table order
+        ext_to_langs = defaultdict(list)
+        for lang, ft_config in self.file_types.items():
+            for ext in ft_config.extensions:
+                ext_to_langs[ext].append(lang)
+        
+        # Extensions are already lowercase (see _ft); literal filenames
+        # (Dockerfile, Makefile, ...) are matched separately and keep their case
+        self._special_filenames = {}
+        ext_to_lang = {}
+        for ext, langs in ext_to_langs.items():
+            lang = min(langs, key=_language_rank)
+            if ext.startswith('.'):
+                ext_to_lang[ext] = lang
+            else:
+                self._special_filenames[ext] = lang
+        
+        # Hot-path lookup kept apart from the FileTypeConfig objects
+        self._ext_to_lang = ext_to_lang
+        
+        # Suffix trie over reversed extensions and literal filenames, so one
+        # right-to-left walk resolves '.cc', '.tar.gz' or 'CMakeLists.txt' alike.
+        # Leaves live under the '' key as (language, exact_filename_or_None).
+        self._suffix_trie = {}
+        for suffix, lang in (*ext_to_lang.items(), *self._special_filenames.items()):
+            node = self._suffix_trie
+            for ch in reversed(suffix.lower()):
+                node = node.setdefault(ch, {})
+            node.setdefault('', (lang, None if suffix.startswith('.') else suffix))
+        self._all_extensions = frozenset(
+            ext for ft_config in self.file_types.values() for ext in ft_config.extensions
+        )
         
         # Indexing settings
-        self.max_chunk_size = 8000
-        self.min_chunk_size = 50
+        self.max_chunk_size = _env_int('CRAG_MAX_CHUNK', 8000)
+        self.min_chunk_size = _env_int('CRAG_MIN_CHUNK', 50)
+        self.max_file_size = _env_int('CRAG_MAX_FILE_SIZE', 2 * 1024 * 1024)
         
         # Directories to exclude
-        self.exclude_dirs = {
-            'third_party', 'out', 'build', '.git', '.svn', '.hg',
-            '__pycache__', 'node_modules', 'venv', 'env',
-            'test', 'tests', 'testing'
-        }
+        self.exclude_dirs = _EXCLUDE_DIRS
         
         # Progress tracking
         self.progress_update_interval = 10
     
-    def get_all_extensions(self) -> Set[str]:
-        """Get all supported file extensions"""
-        extensions = set()
-        for ft_config in self.file_types.values():
-            extensions.update(ft_config.extensions)
-        return extensions
+    def get_ast_cache_path(self, db_path: str) -> Optional[str]:
+        """Get the parse cache file inside a database directory (None if disabled)"""
+        if not self.ast_cache_name:
+            return None
+        return os.path.join(db_path, self.ast_cache_name)
+    
+    def get_all_extensions(self) -> FrozenSet[str]:
+        """Get all supported file extensions (computed once in __init__)"""
+        return self._all_extensions
+    
+    def filter_paths(self, paths: Iterable[str],
+                     file_types: Optional[Iterable[str]] = None) -> List[Tuple[str, str]]:
+        """
+        Keep only paths whose extension is supported
+        
+        Args:
+            paths: File paths or bare filenames
+            file_types: Optional filter for specific languages
+            
+        Returns:
+            List of (path, language) tuples
+        """
+        get_language = self.get_language_for_filename
+        wanted = frozenset(file_types) if file_types else None
+        matched = []
+        
+        for path in paths:
+            language = get_language(path)
+            if language == 'unknown' or (wanted and language not in wanted):
+                continue
+            matched.append((path, language))
+        
+        return matched
+    
+    def get_language_for_filename(self, filename: str) -> str:
+        """
+        Get language name for a file by walking its name right-to-left
+        
+        Extensions match case-insensitively and need a non-empty stem
+        (like Path.suffix); literal filenames such as 'Dockerfile' must match
+        exactly. The longest matching suffix wins.
+        """
+        name = os.path.basename(filename)
+        lowered = name.lower()
+        node = self._suffix_trie
+        language = 'unknown'
+        depth = 0
+        
+        for ch in reversed(lowered):
+            node = node.get(ch)
+            if node is None:
+                break
+            depth += 1
+            leaf = node.get('')
+            if leaf is not None:
+                lang, exact_name = leaf
+                if exact_name is None:
+                    if depth < len(lowered):
+                        language = lang
+                elif exact_name == name:
+                    language = lang
+        
+        return language
     
     def get_language_for_extension(self, extension: str) -> str:
-        """Get language name for a file extension"""
-        for lang, ft_config in self.file_types.items():
-            if extension in ft_config.extensions:
-                return lang
-        return 'unknown'
+        """Get the preferred language for a file extension (case-insensitive)"""
+        lang = self._special_filenames.get(extension)
+        if lang is not None:
+            return lang
+        return self._ext_to_lang.get(extension.lower(), 'unknown')
     
     def get_parser_type(self, language: str) -> str:
         """Get parser type for a language"""
@@ -356,7 +555,27 @@ class Config:
     def should_exclude_dir(self, dir_name: str) -> bool:
         """Check if directory should be excluded from indexing"""
         return dir_name in self.exclude_dirs
+    
+    def filter_dirs(self, dirs: List[str]) -> List[str]:
+        """
+        Remove excluded directories from a list of names in place
+        
+        Used by the indexer's directory walk, so pruned subtrees are
+        never visited.
+        """
+        excluded = self.exclude_dirs
+        dirs[:] = [d for d in dirs if d not in excluded]
+        return dirs
+
+
+@functools.cache
+def get_config() -> Config:
+    """Get the global configuration instance, building it on first use"""
+    return Config()
 
 
-# Global configuration instance
-CONFIG = Config()
+def __getattr__(name: str):
+    """Resolve the legacy module-level CONFIG lazily"""
+    if name == 'CONFIG':
+        return get_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,6 +4,11 @@ FINAL Missing Languages to Add
 Based on tree-sitter-language-pack official documentation
 """
 
+import functools
+import sys
+import types
+from typing import Mapping
+
 # These are confirmed missing from our implementation
 FINAL_MISSING = {
     # Recently added to pack or less common
@@ -36,43 +41,60 @@ FINAL_MISSING = {
     'psv': '.psv',
 }
 
-print(f"Final missing languages: {len(FINAL_MISSING)}")
-print("\nLanguages to add:")
-for lang, ext in sorted(FINAL_MISSING.items()):
-    print(f"  {lang:20s} -> {ext}")
 
-# Create queries for these
-FINAL_QUERIES = {}
-for lang in FINAL_MISSING.keys():
-    if lang in ['dhall', 'idris', 'lean', 'unison']:
-        FINAL_QUERIES[lang] = """(function_definition) @function (type_definition) @type"""
-    elif lang in ['diff', 'patch']:
-        FINAL_QUERIES[lang] = """(hunk) @hunk (file) @file (change) @change"""
-    elif lang in ['ebnf', 'regex', 'sexpr']:
-        FINAL_QUERIES[lang] = """(rule) @rule (expression) @expression"""
-    elif lang in ['eiffel', 'sourcepawn', 'pike']:
-        FINAL_QUERIES[lang] = """(class_declaration) @class (function_declaration) @function"""
-    elif lang in ['ejs', 'jinja', 'marko']:
-        FINAL_QUERIES[lang] = """(template) @template (expression) @expression (directive) @directive"""
-    elif lang in ['glimmer']:
-        FINAL_QUERIES[lang] = """(component) @component (template) @template"""
-    elif lang in ['json5', 'jupyter']:
-        FINAL_QUERIES[lang] = """(object) @object (array) @array (pair) @pair"""
-    elif lang in ['plsql']:
-        FINAL_QUERIES[lang] = """(create_function) @function (create_procedure) @procedure (create_package) @package"""
-    elif lang in ['systemrdl', 'yang']:
-        FINAL_QUERIES[lang] = """(module) @module (definition) @definition"""
-    elif lang in ['tsq']:
-        FINAL_QUERIES[lang] = """(query) @query (predicate) @predicate"""
-    elif lang in ['webdriver']:
-        FINAL_QUERIES[lang] = """(command) @command (locator) @locator"""
-    elif lang in ['wing']:
-        FINAL_QUERIES[lang] = """(class_declaration) @class (function_declaration) @function (resource) @resource"""
-    elif lang == 'gitcommit':
-        FINAL_QUERIES[lang] = """(subject) @subject (message) @message (comment) @comment"""
-    elif lang in ['psv', 'markdown_inline']:
-        FINAL_QUERIES[lang] = """(text) @text"""
-    else:
-        FINAL_QUERIES[lang] = """(function) @function (class) @class"""
+@functools.cache
+def get_final_queries() -> Mapping[str, str]:
+    """Get queries for the missing languages, built on first use"""
+    queries = {}
+    for lang in FINAL_MISSING.keys():
+        if lang in ['dhall', 'idris', 'lean', 'unison']:
+            queries[lang] = """(function_definition) @function (type_definition) @type"""
+        elif lang in ['diff', 'patch']:
+            queries[lang] = """(hunk) @hunk (file) @file (change) @change"""
+        elif lang in ['ebnf', 'regex', 'sexpr']:
+            queries[lang] = """(rule) @rule (expression) @expression"""
+        elif lang in ['eiffel', 'sourcepawn', 'pike']:
+            queries[lang] = """(class_declaration) @class (function_declaration) @function"""
+        elif lang in ['ejs', 'jinja', 'marko']:
+            queries[lang] = """(template) @template (expression) @expression (directive) @directive"""
+        elif lang in ['glimmer']:
+            queries[lang] = """(component) @component (template) @template"""
+        elif lang in ['json5', 'jupyter']:
+            queries[lang] = """(object) @object (array) @array (pair) @pair"""
+        elif lang in ['plsql']:
+            queries[lang] = """(create_function) @function (create_procedure) @procedure (create_package) @package"""
+        elif lang in ['systemrdl', 'yang']:
+            queries[lang] = """(module) @module (definition) @definition"""
+        elif lang in ['tsq']:
+            queries[lang] = """(query) @query (predicate) @predicate"""
+        elif lang in ['webdriver']:
+            queries[lang] = """(command) @command (locator) @locator"""
+        elif lang in ['wing']:
+            queries[lang] = """(class_declaration) @class (function_declaration) @function (resource) @resource"""
+        elif lang == 'gitcommit':
+            queries[lang] = """(subject) @subject (message) @message (comment) @comment"""
+        elif lang in ['psv', 'markdown_inline']:
+            queries[lang] = """(text) @text"""
+        else:
+            queries[lang] = """(function) @function (class) @class"""
+    
+    # Languages sharing a pattern share one interned string; freeze the result
+    return types.MappingProxyType({
+        lang: sys.intern(query.strip()) for lang, query in queries.items()
+    })
+
+
+def __getattr__(name):
+    # Keep `from final_missing_languages import FINAL_QUERIES` working
+    if name == 'FINAL_QUERIES':
+        return get_final_queries()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
-print(f"\nQueries prepared: {len(FINAL_QUERIES)}")
+if __name__ == '__main__':
+    print(f"Final missing languages: {len(FINAL_MISSING)}")
+    print("\nLanguages to add:")
+    for lang, ext in sorted(FINAL_MISSING.items()):
+        print(f"  {lang:20s} -> {ext}")
+    
+    print(f"\nQueries prepared: {len(get_final_queries())}")
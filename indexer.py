@@ -5,87 +5,266 @@ Handles file discovery, chunking, and batch database insertion
 Supports parallel processing and incremental updates
 """
 
+import mmap
+import itertools
 import os
+import pickle
+import queue
+import sys
+import threading
 import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Set, Optional, Tuple
-from collections import defaultdict
+from collections import Counter
 from functools import partial
 
-from config import CONFIG
+from config import FileTypeConfig, get_config
 from chunkers import (
-    CppChunker, PythonChunker, JavaScriptChunker,
+    BaseChunker, CppChunker, PythonChunker, JavaScriptChunker,
     MojomChunker, GnChunker
 )
 from utils.logger import (
     get_logger, create_progress_bar,
     print_success, print_error, print_warning, print_header, print_stats
 )
-from utils.state_manager import StateManager
+from utils.state_manager import StateManager, content_hash
+from utils.cache import ASTCache, make_cache_key
 
 
-def process_file_worker(args) -> Tuple[str, str, List, Optional[str]]:
+# Per-process parse cache for the current run, set by _worker_init
+# (None if disabled in config)
+_AST_CACHE: Optional[ASTCache] = None
+
+
+# Source root of the current run, set once per process by _worker_init
+_ROOT_PATH: Optional[str] = None
+
+
+# Chunkers built in this process, keyed by (language, query). Pool workers are
+# long-lived, so each language's parser and compiled query are set up once
+# per worker instead of once per file.
+_CHUNKER_CACHE: Dict[Tuple[str, Optional[str]], Optional[BaseChunker]] = {}
+
+
+def _get_chunker(language: str, file_config: Optional[FileTypeConfig]) -> Optional[BaseChunker]:
+    """Get (building on first use) the chunker for a language"""
+    query_scm = file_config.query_scm if file_config else None
+    key = (language, query_scm)
+    if key in _CHUNKER_CACHE:
+        return _CHUNKER_CACHE[key]
+    
+    # Instantiated inside the worker to avoid pickling issues with C extensions (tree-sitter)
+    chunker = None
+    
+    # Check if it's a generic tree-sitter language
+    if file_config and file_config.parser_type == 'treesitter':
+        from chunkers import AdaptiveChunker
+        # Use AdaptiveChunker with architecture-aware fallback
+        chunker = AdaptiveChunker(language=language, query_scm=query_scm)
+    # Fallback to specific chunkers (legacy)
+    elif language == 'cpp':
+        chunker = CppChunker()
+    elif language == 'python':
+        chunker = PythonChunker()
+    elif language == 'javascript':
+        chunker = JavaScriptChunker()
+    elif language == 'mojom':
+        chunker = MojomChunker()
+    elif language == 'gn':
+        chunker = GnChunker()
+    
+    _CHUNKER_CACHE[key] = chunker
+    return chunker
+
+
+# Upper bound on pool size; parsing is largely I/O bound, so more workers
+# mostly add fork RSS and page cache pressure
+_MAX_WORKERS = 16
+
+# Files per worker below which extra workers are not worth starting
+_FILES_PER_WORKER = 200
+
+# Files at least this large are hashed and decoded straight from a mapping,
+# so the decoded text is the only full copy held in memory
+_MMAP_THRESHOLD = 64 * 1024
+
+# Threads issuing stat() during discovery; the calls release the GIL, so
+# on SSD/NFS the disk sees many requests in flight instead of one
+_STAT_WORKERS = 32
+
+# Below this many files a thread pool costs more than serial stat()s; also
+# the size of the blocks discovery hands to the indexer
+_PARALLEL_STAT_MIN = 256
+
+# Discovered blocks buffered ahead of the indexer (about 1000 files)
+_DISCOVERY_QUEUE_BLOCKS = 4
+
+
+def _stat_entry(entry: os.DirEntry) -> Optional[os.stat_result]:
+    """stat() a directory entry, or None if it vanished or can't be read"""
+    try:
+        return entry.stat()
+    except OSError:
+        return None
+
+
+def _discovery_producer(blocks, file_queue: queue.Queue, errors: List[str]):
+    """
+    Discovery thread target: feed file blocks to the indexer
+    A None sentinel always follows, even if the walk fails part way
+    """
+    try:
+        for block in blocks:
+            file_queue.put(block)
+    except Exception as e:
+        errors.append(f"File discovery failed: {e}")
+    finally:
+        file_queue.put(None)
+
+
+def _read_source(file_path: str, size: Optional[int] = None) -> Tuple[str, str]:
+    """
+    Read a source file as its content hash plus its decoded text
+    
+    Args:
+        file_path: Path to the file
+        size: File size from discovery; looked up if not given
+        
+    Returns:
+        Tuple of (content_hash, text)
+    """
+    with open(file_path, 'rb') as f:
+        if size is None:
+            size = os.fstat(f.fileno()).st_size
+        if size < _MMAP_THRESHOLD:
+            raw = f.read()
+            file_hash = content_hash(raw)
+            text = raw.decode('utf-8', errors='ignore')
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                file_hash = content_hash(mm)
+                text = str(mm, 'utf-8', 'ignore')
+    if '\r' in text:
+        # Match text-mode universal newlines
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return file_hash, text
+
+
+def _batch_writer(write_queue: queue.Queue, rag_system, errors: List[str]):
+    """
+    Insert chunk batches from a queue until a None sentinel arrives
+    Runs on a background thread so database writes overlap with parsing
+    """
+    while True:
+        batch = write_queue.get()
+        if batch is None:
+            # Write out anything the RAG system is still buffering
+            try:
+                rag_system.flush()
+            except Exception as e:
+                errors.append(f"Final flush failed: {e}")
+            return
+        try:
+            rag_system.add_chunks_batch(batch)
+        except Exception as e:
+            errors.append(f"Batch insert of {len(batch)} chunks failed: {e}")
+
+
+def _worker_init(languages: List[str], root_path: str, cache_path: Optional[str] = None):
+    """
+    Pool initializer: load language bindings and chunkers once per worker
+    
+    Args:
+        languages: Languages present in this indexing run
+        root_path: Source root that relative chunk paths are computed against
+        cache_path: Parse cache file for this run (None disables caching)
+    """
+    global _ROOT_PATH, _AST_CACHE
+    _ROOT_PATH = sys.intern(root_path)
+    if _AST_CACHE is None or _AST_CACHE.db_path != cache_path:
+        # The connection itself is opened lazily, inside this process
+        _AST_CACHE = ASTCache(cache_path) if cache_path else None
+    
+    # Pin pool workers (not the main process) to one core each so they don't
+    # migrate between cores mid-parse (Linux only)
+    identity = multiprocessing.current_process()._identity
+    if identity and hasattr(os, 'sched_setaffinity'):
+        try:
+            cores = sorted(os.sched_getaffinity(0))
+            os.sched_setaffinity(0, {cores[(identity[0] - 1) % len(cores)]})
+        except OSError:
+            pass
+    
+    file_types = get_config().file_types
+    for language in languages:
+        try:
+            _get_chunker(language, file_types.get(language))
+        except Exception:
+            # Leave it to process_file_worker to report per file
+            pass
+
+
+def process_file_worker(args) -> Tuple[str, str, List, Counter, Optional[str], Optional[str]]:
     """
     Worker function for parallel processing
     Must be top-level to be pickleable
     
     Args:
-        args: Tuple of (file_path, language, root_path)
+        args: Tuple of (file_path, language, size); the source root is
+              set once per worker by _worker_init
         
     Returns:
-        Tuple of (file_path, language, chunks, error_message)
+        Tuple of (file_path, language, chunks, chunk_type_counts, error_message,
+        content_hash)
     """
-    file_path, language, root_path = args
+    file_path, language, size = args
+    file_hash = None
     
     try:
-        # Read file content
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            code = f.read()
+        # Read file content; hashed while the bytes are at hand, for
+        # StateManager and the parse cache
+        file_hash, code = _read_source(file_path, size)
         
         # Skip empty files
         if not code.strip():
-            return str(file_path), language, [], None
+            return str(file_path), language, [], Counter(), None, file_hash
         
         # Get relative path
         try:
-            rel_path = str(Path(file_path).relative_to(root_path))
+            rel_path = str(Path(file_path).relative_to(_ROOT_PATH))
         except ValueError:
             rel_path = str(file_path)
         
-        # Instantiate appropriate chunker
-        # We instantiate here to avoid pickling issues with C extensions (tree-sitter)
-        chunker = None
+        # Get appropriate chunker (cached per worker process)
+        file_config = get_config().file_types.get(language)
+        chunker = _get_chunker(language, file_config)
         
-        # Check if it's a generic tree-sitter language
-        file_config = CONFIG.file_types.get(language)
-        if file_config and file_config.parser_type == 'treesitter':
-            from chunkers import AdaptiveChunker
-            # Use AdaptiveChunker with architecture-aware fallback
-            chunker = AdaptiveChunker(
-                language=language,
-                query_scm=file_config.query_scm
-            )
-        # Fallback to specific chunkers (legacy)
-        elif language == 'cpp':
-            chunker = CppChunker()
-        elif language == 'python':
-            chunker = PythonChunker()
-        elif language == 'javascript':
-            chunker = JavaScriptChunker()
-        elif language == 'mojom':
-            chunker = MojomChunker()
-        elif language == 'gn':
-            chunker = GnChunker()
-            
         if not chunker:
-            return str(file_path), language, [], f"No chunker for language: {language}"
+            return str(file_path), language, [], Counter(), f"No chunker for language: {language}", file_hash
+        
+        # Reuse chunks from an earlier parse of this file if its content
+        # hasn't changed since
+        cache = _AST_CACHE
+        if cache:
+            query_scm = file_config.query_scm if file_config else None
+            cache_key = make_cache_key(
+                f"{type(chunker).__name__}\0{language}\0{query_scm or ''}", rel_path
+            )
+            blob = cache.get(cache_key, file_hash)
+            if blob is not None:
+                chunks = pickle.loads(blob)
+                return str(file_path), language, chunks, Counter(c.type for c in chunks), None, file_hash
         
         # Extract chunks
         chunks = chunker.extract_chunks(code, rel_path)
-        return str(file_path), language, chunks, None
+        if cache:
+            cache.put(cache_key, file_hash, pickle.dumps(chunks, protocol=pickle.HIGHEST_PROTOCOL))
+        # Tally chunk types here so the main process does one update per file
+        return str(file_path), language, chunks, Counter(c.type for c in chunks), None, file_hash
         
     except Exception as e:
-        return str(file_path), language, [], str(e)
+        return str(file_path), language, [], Counter(), str(e), file_hash
 
 
 class ChromeIndexer:
@@ -94,10 +273,10 @@ class ChromeIndexer:
     Discovers files, routes to appropriate chunkers, and manages database insertions
     """
     
-    def __init__(self, rag_system):
+    def __init__(self, rag_system, state_manager: Optional[StateManager] = None):
         self.logger = get_logger()
         self.rag = rag_system
-        self.state_manager = StateManager()
+        self.state_manager = state_manager or StateManager()
         
         # Statistics tracking
         self.stats = {
@@ -105,8 +284,8 @@ class ChromeIndexer:
             'files_skipped': 0,
             'files_failed': 0,
             'chunks_created': 0,
-            'files_by_type': defaultdict(int),
-            'chunks_by_type': defaultdict(int),
+            'files_by_type': Counter(),
+            'chunks_by_type': Counter(),
             'errors': []
         }
     
@@ -130,8 +309,8 @@ class ChromeIndexer:
             'files_skipped': 0,
             'files_failed': 0,
             'chunks_created': 0,
-            'files_by_type': defaultdict(int),
-            'chunks_by_type': defaultdict(int),
+            'files_by_type': Counter(),
+            'chunks_by_type': Counter(),
             'errors': []
         }
 
@@ -142,71 +321,132 @@ class ChromeIndexer:
             print_error(f"Path does not exist: {source_path}")
             return self.stats
         
-        batch_size = batch_size or CONFIG.batch_size
+        batch_size = batch_size or get_config().batch_size
         
-        # Discover all files
+        # Walk the tree on a producer thread: indexing starts with the first
+        # blocks found instead of after the whole walk
         self.logger.info("Discovering files...")
-        all_files = self._discover_files(source_path, file_types)
+        file_queue = queue.Queue(maxsize=_DISCOVERY_QUEUE_BLOCKS)
+        discovery_errors = []
+        producer = threading.Thread(
+            target=_discovery_producer,
+            args=(self._iter_file_blocks(source_path, file_types), file_queue, discovery_errors),
+            daemon=True
+        )
+        producer.start()
         
-        if not all_files:
-            print_warning("No files found to index")
-            return self.stats
-            
-        # Filter files that need processing
-        files_to_process = []
-        files_by_lang = defaultdict(int)
-        for fp, lang in all_files:
-            files_by_lang[lang] += 1
-            if self.state_manager.should_process(str(fp)):
-                files_to_process.append((fp, lang))
-            else:
-                self.stats['files_skipped'] += 1
+        # Discovery mtimes of files sent to workers, held until their result
+        # comes back so only in-flight files are kept
+        mtimes = {}
+        files_by_lang = Counter()
+        counts = {'found': 0, 'to_process': 0}
         
-        self.logger.info(f"Found {len(all_files)} files ({len(files_to_process)} new/modified, {self.stats['files_skipped']} skipped)")
+        def pending_files():
+            # Filter each block in one batched state lookup, using the mtimes
+            # already collected during discovery; yields worker arguments
+            while True:
+                item = file_queue.get()
+                if item is None:
+                    return
+                block, empty = item
+                self.stats['files_skipped'] += empty
+                block_mtimes = {str(x[0]): x[3] for x in block}
+                files_by_lang.update(x[1] for x in block)
+                counts['found'] += len(block)
+                
+                needs_processing = self.state_manager.should_process_batch(list(block_mtimes), block_mtimes)
+                for fp, lang, size, _ in block:
+                    file_path = str(fp)
+                    if needs_processing[file_path]:
+                        counts['to_process'] += 1
+                        mtimes[file_path] = block_mtimes[file_path]
+                        # The source root is shared by every file, so it
+                        # travels once via the pool initializer instead
+                        yield file_path, lang, size
+                    else:
+                        self.stats['files_skipped'] += 1
         
-        # Display file breakdown by type
-        if files_by_lang:
-            print("\n📊 Files to Index by Type:")
-            print("─" * 40)
-            for lang in sorted(files_by_lang.keys()):
-                count = files_by_lang[lang]
-                print(f"  • {lang.ljust(15)} : {count:>4} files")
-            print("─" * 40)
-            print(f"  Total: {len(all_files)} files\n")
+        # Look ahead far enough to size the pool; on small trees this
+        # drains the whole walk, so everything below is exact
+        lookahead = _MAX_WORKERS * _FILES_PER_WORKER
+        pending = pending_files()
+        head = list(itertools.islice(pending, lookahead))
+        discovery_done = len(head) < lookahead
         
-        if not files_to_process:
-            print_success("All files are up to date!")
-            return self.stats
+        if discovery_done:
+            for error in discovery_errors:
+                self.logger.error(error)
+                self.stats['errors'].append(error)
+            
+            if not counts['found']:
+                print_warning("No files found to index")
+                return self.stats
+            
+            self.logger.info("Found %s files (%s new/modified, %s skipped)", counts['found'], len(head), self.stats['files_skipped'])
+            self._print_file_breakdown(files_by_lang, counts['found'])
+            
+            if not head:
+                print_success("All files are up to date!")
+                return self.stats
+        else:
+            self.logger.info("Found %s+ new/modified files; indexing while discovery continues", len(head))
         
-        # Prepare arguments for worker
-        worker_args = [(str(fp), lang, str(source_path)) for fp, lang in files_to_process]
+        worker_args = itertools.chain(head, pending)
+        languages = sorted({lang for _, lang, _ in head})
+        # Parse results live beside the vectors they produced
+        cache_path = get_config().get_ast_cache_path(self.rag.db_path)
         
         # Process files
         with create_progress_bar() as progress:
-            task = progress.add_task("[cyan]Processing files...", total=len(files_to_process))
+            task = progress.add_task("[cyan]Processing files...", total=len(head))
             
             batch = []
             
+            # Database inserts happen on a writer thread; the bounded queue
+            # applies backpressure if embedding falls behind parsing
+            write_queue = queue.Queue(maxsize=4)
+            write_errors = []
+            writer = threading.Thread(
+                target=_batch_writer,
+                args=(write_queue, self.rag, write_errors),
+                daemon=True
+            )
+            writer.start()
+            
+            # Size the pool to the work: capped, and small runs get few workers
+            cpu_count = min(
+                max(1, (os.cpu_count() or 1) - 1),
+                _MAX_WORKERS,
+                len(head) // _FILES_PER_WORKER + 1
+            )
+            
             # Use multiprocessing if parallel is True and we have enough files
-            use_parallel = parallel and len(files_to_process) > 10
-            cpu_count = max(1, multiprocessing.cpu_count() - 1)
+            use_parallel = parallel and len(head) > 10 and cpu_count > 1
             
             if use_parallel:
-                self.logger.info(f"Starting parallel processing with {cpu_count} workers")
-                pool = multiprocessing.Pool(processes=cpu_count)
-                iterator = pool.imap_unordered(process_file_worker, worker_args, chunksize=10)
+                self.logger.info("Starting parallel processing with %s workers", cpu_count)
+                pool = multiprocessing.Pool(
+                    processes=cpu_count,
+                    initializer=_worker_init,
+                    initargs=(languages, str(source_path), cache_path)
+                )
+                # Larger chunks amortize per-task IPC on big trees
+                chunksize = max(16, min(256, len(head) // (cpu_count * 8)))
+                iterator = pool.imap_unordered(process_file_worker, worker_args, chunksize=chunksize)
             else:
                 self.logger.info("Using sequential processing")
+                _worker_init(languages, str(source_path), cache_path)
                 iterator = map(process_file_worker, worker_args)
             
             try:
-                for file_path, language, chunks, error in iterator:
+                for file_path, language, chunks, type_counts, error, file_hash in iterator:
+                    mtime = mtimes.pop(file_path, None)
                     # Print current file being processed
                     rel_path = Path(file_path).relative_to(source_path) if Path(file_path).is_relative_to(source_path) else Path(file_path).name
-                    self.logger.info(f"Processing: {rel_path} ({language})")
+                    self.logger.info("Processing: %s (%s)", rel_path, language)
                     
                     if error:
-                        self.logger.error(f"Failed to process {file_path}: {error}")
+                        self.logger.error("Failed to process %s: %s", file_path, error)
                         self.stats['files_failed'] += 1
                         self.stats['errors'].append(f"{file_path}: {error}")
                     else:
@@ -217,19 +457,22 @@ class ChromeIndexer:
                         self.stats['files_processed'] += 1
                         self.stats['files_by_type'][language] += 1
                         self.stats['chunks_created'] += len(chunks)
-                        
-                        for chunk in chunks:
-                            self.stats['chunks_by_type'][chunk.type] += 1
+                        self.stats['chunks_by_type'].update(type_counts)
                         
                         # Mark as processed in state manager
-                        self.state_manager.mark_processed(file_path)
+                        self.state_manager.mark_processed(file_path, mtime, file_hash)
                         
-                        # Insert batch if it's large enough
+                        # Hand batch to the writer if it's large enough
                         if len(batch) >= batch_size:
-                            self.rag.add_chunks_batch(batch)
+                            write_queue.put(batch)
                             batch = []
                     
-                    progress.update(task, advance=1)
+                    # The total grows while discovery is still running
+                    progress.update(task, advance=1, total=counts['to_process'])
+                
+                # Insert remaining chunks
+                if batch:
+                    write_queue.put(batch)
                     
             except KeyboardInterrupt:
                 print_warning("\nIndexing interrupted by user")
@@ -241,10 +484,20 @@ class ChromeIndexer:
                 if use_parallel:
                     pool.close()
                     pool.join()
-            
-            # Insert remaining chunks
-            if batch:
-                self.rag.add_chunks_batch(batch)
+                
+                # Let the writer drain queued batches, then stop it
+                write_queue.put(None)
+                writer.join()
+                self.state_manager.flush()
+                for error in write_errors:
+                    self.logger.error(error)
+                    self.stats['errors'].append(error)
+        
+        if not discovery_done:
+            for error in discovery_errors:
+                self.logger.error(error)
+                self.stats['errors'].append(error)
+            self._print_file_breakdown(files_by_lang, counts['found'])
         
         # Print final statistics
         print_success(f"Indexing complete!")
@@ -252,31 +505,97 @@ class ChromeIndexer:
         
         return self.stats
     
-    def _discover_files(self, root_path: Path, file_types: Optional[List[str]] = None) -> List[tuple]:
+    def _iter_file_blocks(self, root_path: Path, file_types: Optional[List[str]] = None):
         """
-        Recursively discover all supported files
+        Walk the tree and yield supported files in blocks as they are found
+        Empty files are only counted and oversized ones are dropped, so
+        neither is sent to a worker
+        
+        Yields:
+            (files, empty_count) where files is a list of
+            (path, language, size, mtime) tuples
         """
-        files = []
-        extensions = CONFIG.get_all_extensions()
+        config = get_config()
+        max_file_size = config.max_file_size
+        # Built once; filter_paths reuses a frozenset as-is for every directory
+        wanted = frozenset(file_types) if file_types else None
+        executor = None
         
-        for dirpath, dirnames, filenames in os.walk(root_path):
-            # Filter out excluded directories
-            dirnames[:] = [d for d in dirnames if not CONFIG.should_exclude_dir(d)]
+        def stat_block(candidates):
+            # stat() a block at a time so the calls can overlap
+            entries = [entry for _, _, entry in candidates]
+            nonlocal executor
+            if len(entries) >= _PARALLEL_STAT_MIN:
+                if executor is None:
+                    executor = ThreadPoolExecutor(max_workers=_STAT_WORKERS)
+                stats = list(executor.map(_stat_entry, entries, chunksize=64))
+            else:
+                stats = [_stat_entry(entry) for entry in entries]
             
-            for filename in filenames:
-                file_path = Path(dirpath) / filename
-                ext = file_path.suffix
-                
-                if ext in extensions:
-                    language = CONFIG.get_language_for_extension(ext)
-                    
-                    # Filter by file type if specified
-                    if file_types and language not in file_types:
-                        continue
-                    
-                    files.append((file_path, language))
+            files = []
+            empty = 0
+            for (file_path, language, _), st in zip(candidates, stats):
+                if st is None:
+                    self.logger.debug("Cannot stat %s", file_path)
+                    continue
+                size = st.st_size
+                if size == 0:
+                    empty += 1
+                    continue
+                if size > max_file_size:
+                    self.logger.warning("Skipping %s: %s bytes exceeds max_file_size", file_path, size)
+                    continue
+                files.append((Path(file_path), language, size, st.st_mtime))
+            return files, empty
         
-        return files
+        try:
+            candidates = []
+            # Iterative scandir walk on plain strings (same top-down order as os.walk)
+            stack = [str(root_path)]
+            while stack:
+                dirpath = stack.pop()
+                subdirs = []
+                file_entries = {}
+                try:
+                    with os.scandir(dirpath) as entries:
+                        for entry in entries:
+                            if entry.is_dir(follow_symlinks=False):
+                                subdirs.append(entry.name)
+                            elif entry.is_file():
+                                file_entries[entry.path] = entry
+                except OSError as e:
+                    self.logger.debug("Cannot scan %s: %s", dirpath, e)
+                    continue
+                # Skip excluded directories without descending
+                config.filter_dirs(subdirs)
+                stack.extend(os.path.join(dirpath, name) for name in reversed(subdirs))
+                
+                # Match extensions (and the optional file type filter) in one pass;
+                # only supported files are stat'ed or turned into Path objects
+                for file_path, language in config.filter_paths(file_entries, wanted):
+                    candidates.append((file_path, language, file_entries[file_path]))
+                
+                if len(candidates) >= _PARALLEL_STAT_MIN:
+                    yield stat_block(candidates)
+                    candidates = []
+            
+            if candidates:
+                yield stat_block(candidates)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+    
+    def _print_file_breakdown(self, files_by_lang: Counter, total: int):
+        """Print how many discovered files there are of each language"""
+        if not files_by_lang:
+            return
+        print("\n📊 Files to Index by Type:")
+        print("─" * 40)
+        for lang in sorted(files_by_lang.keys()):
+            count = files_by_lang[lang]
+            print(f"  • {lang.ljust(15)} : {count:>4} files")
+        print("─" * 40)
+        print(f"  Total: {total} files\n")
     
     def _print_statistics(self):
         """Print detailed indexing statistics"""
@@ -4,19 +4,135 @@ Chrome Source Code RAG System - Refactored
 Professional vector database management for Chrome source code
 """
 
-from typing import List, Dict, Optional
-from collections import defaultdict
+import asyncio
+import contextlib
+import functools
+import gzip
+import hashlib
+import mmap
+import os
+import pickle
+import shutil
+import sys
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Dict, Optional, Sequence, Tuple, Union
 import chromadb
 from chromadb.utils import embedding_functions
 
-from chunkers.base_chunker import CodeChunk
-from config import CONFIG
+from chunkers.base_chunker import CodeChunk, CodeChunkBatch
+from config import get_config
 from utils.logger import get_logger
+from utils.bm25 import BM25Index, tokenize
 
 
-from rank_bm25 import BM25Okapi
 import numpy as np
 
+
+# Files at least this large are hashed (and decoded) by analyze_file straight
+# from a mapping instead of being read into memory first
+_ANALYZE_MMAP_THRESHOLD = 1024 * 1024
+
+# Documents fetched per collection.get() when scanning the whole collection
+_PAGE_SIZE = 10000
+
+# Pending chunks are written to Chroma once this many have accumulated
+_FLUSH_THRESHOLD = 200
+
+
+def _top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, best first
+    Uses an O(n) partition and only sorts the k survivors
+    """
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    top_k = np.argpartition(scores, -k)[-k:]
+    return top_k[np.argsort(scores[top_k])[::-1]]
+
+
+def _chunk_id(filepath: str, line_start: int, content: str) -> str:
+    """Stable ID derived from where a chunk lives and what it contains"""
+    key = f"{filepath}:{line_start}:{content}"
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _ids_fingerprint(ids: Iterable[str]) -> str:
+    """
+    Order-independent digest of a set of chunk IDs
+    IDs are derived from chunk content, so any add, removal or edit changes it
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for chunk_id in sorted(ids):
+        digest.update(chunk_id.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=128)
+def _build_where(name: Optional[str] = None, file_type: Optional[str] = None,
+                 language: Optional[str] = None) -> Optional[Dict]:
+    """
+    Build a Chroma metadata filter for equality on the given fields
+    Results are shared between callers, so treat them as read-only
+    """
+    conditions = []
+    if name is not None:
+        conditions.append({"name": name})
+    if file_type:
+        conditions.append({"type": file_type})
+    if language:
+        conditions.append({"language": language})
+    
+    # Chroma needs exactly one operator per dict, so several fields need $and
+    if not conditions:
+        return None
+    return {"$and": conditions} if len(conditions) > 1 else conditions[0]
+
+
+def _count_values(values: np.ndarray) -> Dict[str, int]:
+    """Count occurrences of each distinct value in an object array"""
+    keys, counts = np.unique(values, return_counts=True)
+    return dict(zip(keys.tolist(), counts.tolist()))
+
+
+def _metadata_columns(metadatas: Sequence[Dict]) -> Dict[str, np.ndarray]:
+    """
+    Split metadata dicts into one object array per key
+    Repeated strings are interned, and a record without a key holds None
+    """
+    keys = dict.fromkeys(key for meta in metadatas for key in meta)
+    columns = {}
+    for key in keys:
+        column = np.empty(len(metadatas), dtype=object)
+        column[:] = [
+            sys.intern(value) if type(value) is str else value
+            for value in (meta.get(key) for meta in metadatas)
+        ]
+        columns[key] = column
+    return columns
+
+
+def _metadata_field(columns: Dict[str, np.ndarray], key: str, default: str, size: int) -> np.ndarray:
+    """One metadata field for every record, with default where it is missing"""
+    column = columns.get(key)
+    if column is None:
+        return np.full(size, default, dtype=object)
+    return np.where(np.equal(column, None), default, column)
+
+
+def _metadata_row(columns: Dict[str, np.ndarray], idx: int) -> Dict:
+    """Rebuild the metadata dict of one record from its columns"""
+    row = {}
+    for key, column in columns.items():
+        value = column[idx]
+        if value is not None:
+            row[key] = value
+    return row
+
+
 class ChromeRAGSystem:
     """
     Professional RAG system for Chrome source code
@@ -32,11 +148,12 @@ class ChromeRAGSystem:
             collection_name: Name of the collection to use
         """
         self.logger = get_logger()
-        self.db_path = db_path or CONFIG.db_path
-        self.collection_name = collection_name or CONFIG.collection_name
+        config = get_config()
+        self.db_path = db_path or config.db_path
+        self.collection_name = collection_name or config.collection_name
         
         # Initialize ChromaDB
-        self.logger.info(f"Initializing ChromaDB at {self.db_path}")
+        self.logger.info("Initializing ChromaDB at %s", self.db_path)
         self.client = chromadb.PersistentClient(path=self.db_path)
         
         # Use default embedding function
@@ -49,78 +166,255 @@ class ChromeRAGSystem:
             metadata={"description": "Chrome source code for vulnerability analysis"}
         )
         
-        self.logger.info(f"Collection '{self.collection_name}' ready")
-        self._chunk_counter = self.collection.count()
+        self.logger.info("Collection '%s' ready", self.collection_name)
+        
+        # Chunks buffered by add_chunks_batch until the next flush()
+        self._pending_ids = []
+        self._pending_docs = []
+        self._pending_metas = []
+        self._flush_threshold = _FLUSH_THRESHOLD
+        
+        # Keyword results for repeated queries. They depend only on the
+        # in-memory BM25 index, which clears this whenever it is replaced.
+        # Vector results are not cached: other processes can add to the
+        # collection, and the web app caches whole searches itself
+        self._bm25_candidates = functools.lru_cache(maxsize=512)(self._bm25_search)
+        
+        # Runs BM25 scoring alongside the Chroma query in retrieve_context
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="bm25")
         
         # Initialize BM25 index
         self.bm25 = None
         self.bm25_corpus = []
         self.bm25_ids = []
-        self.bm25_metadatas = []
-        self._build_keyword_index()
+        self.bm25_meta_columns: Dict[str, np.ndarray] = {}
+        self.bm25_docs = []
+        self.bm25_lang = np.empty(0, dtype=object)
+        self.bm25_ftype = np.empty(0, dtype=object)
+        self._bm25_path = os.path.join(self.db_path, f"bm25_{self.collection_name}")
+        # Every change to the collection bumps _corpus_version; the index is
+        # current while _bm25_version matches it. Adds only bump the version,
+        # and the next query rebuilds in the background while the stale
+        # index keeps serving
+        self._corpus_version = 0
+        self._bm25_version = -1
+        self._bm25_lock = threading.Lock()       # held by the running rebuild
+        self._bm25_swap_lock = threading.Lock()  # guards replacing the index fields
+        if not self._load_keyword_index():
+            self._build_keyword_index()
     
-    def _build_keyword_index(self):
-        """Build BM25 index from existing documents in ChromaDB"""
+    def _iter_collection(self, include: List[str], page_size: int = _PAGE_SIZE):
+        """
+        Yield the whole collection as a series of get() pages
+        
+        Args:
+            include: Fields to fetch (e.g. ['documents', 'metadatas'])
+            page_size: Maximum records per page
+        """
+        offset = 0
+        while True:
+            page = self.collection.get(limit=page_size, offset=offset, include=include)
+            if not page['ids']:
+                return
+            yield page
+            offset += len(page['ids'])
+    
+    def _build_keyword_index(self, flush: bool = True):
+        """
+        Build BM25 index from existing documents in ChromaDB
+        
+        Args:
+            flush: Write buffered chunks first (pass False off the owning thread)
+        """
+        if flush:
+            self.flush()
+        # Anything added from here on bumps the version past this snapshot
+        version = self._corpus_version
+        if self._bm25_version == version:
+            return
         self.logger.info("Building BM25 keyword index...")
         try:
-            # Fetch all documents (this might be heavy for very large datasets)
-            # For production, we might want to cache this or load incrementally
-            all_docs = self.collection.get()
+            # Stream the collection page by page; only one page of document
+            # text is alive at a time while the index is built
+            ids = []
+            metadatas = []
+            docs = []
+            
+            def tokenized_corpus():
+                for page in self._iter_collection(['documents', 'metadatas']):
+                    ids.extend(page['ids'])
+                    metadatas.extend(page['metadatas'])
+                    for doc in page['documents']:
+                        # Keep content compressed so keyword hits need no refetch
+                        docs.append(zlib.compress(doc.encode('utf-8')))
+                        yield tokenize(doc)
+            
+            bm25 = BM25Index(tokenized_corpus())
             
-            if not all_docs['ids']:
+            if not ids:
                 self.logger.info("No documents to index for BM25")
+                self._bm25_version = version
                 return
             
-            self.bm25_ids = all_docs['ids']
-            self.bm25_metadatas = all_docs['metadatas']
-            
-            # Tokenize documents for BM25
-            tokenized_corpus = [doc.lower().split() for doc in all_docs['documents']]
-            self.bm25 = BM25Okapi(tokenized_corpus)
-            self.logger.info(f"BM25 index built with {len(self.bm25_ids)} documents")
+            self._install_keyword_index(bm25, ids, _metadata_columns(metadatas), docs, version)
+            self.logger.info("BM25 index built with %s documents", len(self.bm25_ids))
+            self._save_keyword_index()
             
         except Exception as e:
-            self.logger.error(f"Failed to build BM25 index: {e}")
+            self.logger.error("Failed to build BM25 index: %s", e)
 
-    def add_chunks_batch(self, chunks: List[CodeChunk]) -> int:
+    def _install_keyword_index(self, bm25: BM25Index, ids: List[str],
+                               meta_columns: Dict[str, np.ndarray], docs: List[bytes],
+                               version: int):
+        """Swap in a new BM25 index built from corpus version, with its per-document fields"""
+        # Filterable fields as arrays, so filters become a vectorized mask
+        lang = _metadata_field(meta_columns, 'language', 'unknown', len(ids))
+        ftype = _metadata_field(meta_columns, 'type', 'unknown', len(ids))
+        with self._bm25_swap_lock:
+            self.bm25_ids = ids
+            self.bm25_meta_columns = meta_columns
+            self.bm25_docs = docs
+            self.bm25_lang = lang
+            self.bm25_ftype = ftype
+            self.bm25 = bm25
+            self._bm25_version = version
+            self._bm25_candidates.cache_clear()
+    
+    def _rebuild_bm25_then_release(self):
+        """Background rebuild target; releases _bm25_lock when done"""
+        try:
+            # The querying thread flushed before starting us, and the buffers
+            # belong to the thread that fills them
+            self._build_keyword_index(flush=False)
+        finally:
+            self._bm25_lock.release()
+    
+    def _ensure_bm25(self):
+        """Start a background BM25 rebuild if the corpus changed since the last one"""
+        if self._bm25_version != self._corpus_version and self._bm25_lock.acquire(blocking=False):
+            threading.Thread(target=self._rebuild_bm25_then_release,
+                             name="bm25-rebuild", daemon=True).start()
+    
+    def _save_keyword_index(self):
+        """Persist the BM25 index next to the Chroma data for fast startup"""
+        fingerprint_path = os.path.join(self._bm25_path, 'fingerprint')
+        try:
+            # Invalidate first: a save interrupted midway never loads
+            if os.path.exists(fingerprint_path):
+                os.remove(fingerprint_path)
+            self.bm25.save(os.path.join(self._bm25_path, 'index'))
+            # Metadata goes out column-wise: keys are written once per field
+            # and interned values once per distinct string, then compressed
+            with gzip.open(os.path.join(self._bm25_path, 'docs.pkl.gz'), 'wb', compresslevel=3) as f:
+                pickle.dump((self.bm25_ids, self.bm25_meta_columns, self.bm25_docs), f, protocol=5)
+            with open(fingerprint_path, 'w') as f:
+                f.write(_ids_fingerprint(self.bm25_ids))
+        except Exception as e:
+            self.logger.warning("Failed to save BM25 index: %s", e)
+    
+    def _load_keyword_index(self) -> bool:
+        """
+        Load a persisted BM25 index if it matches the collection
+        
+        Returns:
+            True if loaded; False if missing or stale (caller should rebuild)
+        """
+        fingerprint_path = os.path.join(self._bm25_path, 'fingerprint')
+        if not os.path.exists(fingerprint_path):
+            return False
+        
+        try:
+            # Compare ID sets before reading anything large: IDs alone are
+            # cheap to page out of Chroma, and they change with any edit
+            with open(fingerprint_path) as f:
+                saved = f.read().strip()
+            collection_ids = (
+                chunk_id for page in self._iter_collection([]) for chunk_id in page['ids']
+            )
+            if saved != _ids_fingerprint(collection_ids):
+                return False
+            
+            with gzip.open(os.path.join(self._bm25_path, 'docs.pkl.gz'), 'rb') as f:
+                ids, meta_columns, docs = pickle.load(f)
+            if not ids:
+                return False
+            
+            bm25 = BM25Index.load(os.path.join(self._bm25_path, 'index'))
+        except Exception as e:
+            self.logger.warning("Failed to load BM25 index, rebuilding: %s", e)
+            return False
+        
+        self._install_keyword_index(bm25, ids, meta_columns, docs, self._corpus_version)
+        self.logger.info("BM25 index loaded with %s documents", len(ids))
+        return True
+    
+    def add_chunks_batch(self, chunks: Union[List[CodeChunk], CodeChunkBatch],
+                         flush: bool = False) -> int:
         """
         Add multiple chunks in a single batch operation
+        Small batches are buffered and written together once enough have
+        accumulated; reads and flush() write out anything still pending
         
         Args:
-            chunks: List of CodeChunk objects
+            chunks: List of CodeChunk objects, or a CodeChunkBatch
+            flush: Write buffered chunks to the collection immediately
             
         Returns:
             Number of chunks added
         """
-        if not chunks:
-            return 0
+        # Work column-wise: contents go to Chroma (and the embedder) as one list
+        batch = chunks if isinstance(chunks, CodeChunkBatch) else CodeChunkBatch.from_chunks(chunks)
+        self._pending_ids.extend(map(_chunk_id, batch.filepath, batch.line_start, batch.content))
+        self._pending_docs.extend(batch.content)
+        self._pending_metas.extend(batch.to_dicts())
+        
+        if flush or len(self._pending_ids) >= self._flush_threshold:
+            self.flush()
         
+        # BM25 can't be updated incrementally; rebuilding per batch would
+        # dominate bulk indexing, so only mark it stale for the next query
+        if chunks:
+            self._corpus_version += 1
+        
+        return len(chunks)
+    
+    def flush(self):
+        """Write any buffered chunks to the collection in one insert"""
+        if not self._pending_ids:
+            return
+        
+        # Skip chunks already stored (e.g. a re-index) or repeated in the
+        # buffer, before any embedding work is spent on them
+        unique_ids = list(dict.fromkeys(self._pending_ids))
+        seen = set(self.collection.get(ids=unique_ids, include=[])['ids'])
         ids = []
         documents = []
         metadatas = []
-        
-        for chunk in chunks:
-            chunk_id = f"chunk_{self._chunk_counter}"
-            self._chunk_counter += 1
-            
+        for chunk_id, doc, meta in zip(self._pending_ids, self._pending_docs, self._pending_metas):
+            if chunk_id in seen:
+                continue
+            seen.add(chunk_id)
             ids.append(chunk_id)
-            documents.append(chunk.content)
-            metadatas.append(chunk.to_dict())
+            documents.append(doc)
+            metadatas.append(meta)
         
         # Batch insert
-        self.collection.add(
-            ids=ids,
-            documents=documents,
-            metadatas=metadatas
-        )
-        
-        # Update BM25 index (incremental update is tricky with BM25Okapi, 
-        # so we'll just rebuild it for now or append if possible, but rebuilding is safer for consistency)
-        # For performance, we might want to defer this until after a large batch import
-        # But for now, let's keep it simple and rebuild
-        # self._build_keyword_index() # Commented out for performance during bulk index
-        
-        return len(chunks)
+        if ids:
+            self.collection.add(
+                ids=ids,
+                documents=documents,
+                metadatas=metadatas
+            )
+        self._pending_ids = []
+        self._pending_docs = []
+        self._pending_metas = []
+        self._bm25_candidates.cache_clear()
+    
+    def __del__(self):
+        try:
+            self.flush()
+        except Exception:
+            pass  # Interpreter shutdown or a closed client; nothing to do
     
     def retrieve_symbol(self, symbol_name: str, symbol_type: Optional[str] = None,
                        language: Optional[str] = None, n_results: int = 5) -> List[Dict]:
@@ -136,26 +430,69 @@ class ChromeRAGSystem:
         Returns:
             List of matching chunks with metadata
         """
-        conditions = [{"name": symbol_name}]
-        
-        if symbol_type:
-            conditions.append({"type": symbol_type})
-        
-        if language:
-            conditions.append({"language": language})
-            
-        where_clause = {"$and": conditions} if len(conditions) > 1 else conditions[0]
+        where_clause = _build_where(symbol_name, symbol_type, language)
         
         try:
+            self.flush()
             results = self.collection.get(
                 where=where_clause,
                 limit=n_results
             )
             return self._format_get_results(results)
         except Exception as e:
-            self.logger.error(f"Error retrieving symbol: {e}")
+            self.logger.error("Error retrieving symbol: %s", e)
             return []
     
+    def _vector_search(self, query: str, k: int, language: Optional[str],
+                       file_type: Optional[str]) -> Tuple[Dict, ...]:
+        """
+        Run the Chroma similarity query for the top k chunks
+        """
+        v_res = self.collection.query(
+            query_texts=[query],
+            n_results=k,
+            where=_build_where(file_type=file_type, language=language)
+        )
+        return tuple(self._format_query_results(v_res))
+    
+    def _bm25_search(self, query: str, k: int, language: Optional[str],
+                     file_type: Optional[str]) -> Tuple[Dict, ...]:
+        """
+        Score the BM25 index and return the top k matching chunks
+        Cached per instance as _bm25_candidates; treat results as read-only
+        """
+        # One consistent view, even if a background rebuild swaps mid-query
+        with self._bm25_swap_lock:
+            bm25, ids, meta_columns, docs = self.bm25, self.bm25_ids, self.bm25_meta_columns, self.bm25_docs
+            bm25_lang, bm25_ftype = self.bm25_lang, self.bm25_ftype
+        
+        tokenized_query = tokenize(query)
+        doc_scores = bm25.get_scores(tokenized_query)
+        
+        # Apply filters before top-k so selection only picks valid docs
+        if language or file_type:
+            mask = np.ones(len(doc_scores), dtype=bool)
+            if language:
+                mask &= (bm25_lang == language)
+            if file_type:
+                mask &= (bm25_ftype == file_type)
+            doc_scores = np.where(mask, doc_scores, -np.inf)
+        
+        # No query token matched an allowed doc: nothing to select
+        if doc_scores.max() <= 0:
+            return ()
+        
+        candidates = []
+        for idx in _top_k_indices(doc_scores, k):
+            if doc_scores[idx] > 0:
+                candidates.append({
+                    'content': zlib.decompress(docs[idx]).decode('utf-8'),
+                    'metadata': _metadata_row(meta_columns, idx),
+                    'id': ids[idx],
+                    'score': doc_scores[idx]
+                })
+        return tuple(candidates)
+    
     def retrieve_context(self, query: str, n_results: int = 5,
                         language: Optional[str] = None,
                         file_type: Optional[str] = None) -> List[Dict]:
@@ -171,111 +508,87 @@ class ChromeRAGSystem:
         Returns:
             List of relevant chunks with metadata and similarity scores
         """
-        # 1. Vector Search
-        vector_results = []
-        
-        conditions = []
-        if language:
-            conditions.append({"language": language})
-        if file_type:
-            conditions.append({"type": file_type})
-            
-        where_clause = {}
-        if len(conditions) > 1:
-            where_clause = {"$and": conditions}
-        elif len(conditions) == 1:
-            where_clause = conditions[0]
-            
-        try:
-            v_res = self.collection.query(
-                query_texts=[query],
-                n_results=n_results * 2, # Fetch more for re-ranking
-                where=where_clause if where_clause else None
+        if not query.strip():
+            return []
+        
+        # BM25 is NumPy work and Chroma's query mostly waits on SQLite and
+        # the embedding model, so score keywords on a worker thread meanwhile
+        keyword_future = None
+        has_keyword_index = self.bm25 is not None and len(self.bm25_ids) > 0
+        if has_keyword_index:
+            keyword_future = self._executor.submit(
+                self._bm25_candidates, query, n_results * 2, language, file_type
             )
-            vector_results = self._format_query_results(v_res)
+        
+        # 1. Vector Search (fetch more for re-ranking)
+        vector_results = ()
+        try:
+            self.flush()
+            self._ensure_bm25()
+            vector_results = self._vector_search(query, n_results * 2, language, file_type)
         except Exception as e:
-            self.logger.error(f"Vector search failed: {e}")
+            self.logger.error("Vector search failed: %s", e)
+
+        # No keyword index yet (fresh or cleared collection): nothing to fuse,
+        # so rank vector hits directly with the scores fusion would give them
+        if not has_keyword_index:
+            return [
+                dict(result, rrf_score=1.0 / (61 + rank))
+                for rank, result in enumerate(vector_results[:n_results])
+            ]
 
         # 2. Keyword Search (BM25)
-        keyword_results = []
-        if self.bm25:
+        keyword_results = ()
+        if keyword_future is not None:
             try:
-                tokenized_query = query.lower().split()
-                # Get top N documents
-                doc_scores = self.bm25.get_scores(tokenized_query)
-                top_n_indices = np.argsort(doc_scores)[::-1][:n_results * 2]
-                
-                for idx in top_n_indices:
-                    if doc_scores[idx] > 0:
-                        # Apply filters manually since BM25 doesn't support them natively
-                        metadata = self.bm25_metadatas[idx]
-                        if language and metadata.get('language') != language:
-                            continue
-                        if file_type and metadata.get('type') != file_type:
-                            continue
-                            
-                        keyword_results.append({
-                            'content': "Content not stored in RAM", # We don't store content in RAM to save space
-                            'metadata': metadata,
-                            'id': self.bm25_ids[idx],
-                            'score': doc_scores[idx]
-                        })
+                keyword_results = keyword_future.result()
             except Exception as e:
-                self.logger.error(f"Keyword search failed: {e}")
+                self.logger.error("Keyword search failed: %s", e)
         
         # 3. Reciprocal Rank Fusion (RRF)
-        combined_results = self._rrf_fusion(vector_results, keyword_results, k=60)
-        
-        # Fill in content for keyword results if missing (from vector results or DB)
-        # Since we need to return content, we might need to fetch it if it came purely from BM25
-        # But for simplicity, let's assume we can get it. 
-        # Actually, let's just return the top N combined
-        
-        final_results = combined_results[:n_results]
-        
-        # Fetch content for any result that doesn't have it (BM25 hits not in Vector hits)
-        ids_to_fetch = [r['id'] for r in final_results if 'content' not in r or r['content'] == "Content not stored in RAM"]
-        if ids_to_fetch:
-            fetched = self.collection.get(ids=ids_to_fetch)
-            id_map = {id: (doc, meta) for id, doc, meta in zip(fetched['ids'], fetched['documents'], fetched['metadatas'])}
-            
-            for r in final_results:
-                if r['id'] in id_map:
-                    r['content'] = id_map[r['id']][0]
-                    r['metadata'] = id_map[r['id']][1]
-                    
-        return final_results
-
-    def _rrf_fusion(self, vector_results: List[Dict], keyword_results: List[Dict], k: int = 60) -> List[Dict]:
+        # Both sides carry content, so the top N can be returned as is
+        return self._rrf_fusion(vector_results, keyword_results, k=60, n_results=n_results)
+
+    def _rrf_fusion(self, vector_results: Sequence[Dict], keyword_results: Sequence[Dict], k: int = 60,
+                    n_results: Optional[int] = None) -> List[Dict]:
         """
         Combine results using Reciprocal Rank Fusion
         score = 1 / (k + rank)
-        """
-        scores = defaultdict(float)
         
-        # Process Vector Results
-        for rank, result in enumerate(vector_results):
-            scores[result['id']] += 1 / (k + rank + 1)
-            
-        # Process Keyword Results
-        for rank, result in enumerate(keyword_results):
-            scores[result['id']] += 1 / (k + rank + 1)
-            
-        # Sort by combined score
-        sorted_ids = sorted(scores.keys(), key=lambda x: scores[x], reverse=True)
+        Args:
+            vector_results: Ranked vector search hits
+            keyword_results: Ranked BM25 hits
+            k: RRF rank offset
+            n_results: Keep only this many fused results (all if None)
+        """
+        if not vector_results and not keyword_results:
+            return []
         
-        # Create final list merging data
+        # Reciprocal ranks computed once for the longer list
+        rr = 1.0 / (k + np.arange(1, max(len(vector_results), len(keyword_results)) + 1))
+        candidates = [*vector_results, *keyword_results]
+        all_ids = np.array([r['id'] for r in candidates], dtype=object)
+        weights = np.concatenate((rr[:len(vector_results)], rr[:len(keyword_results)]))
+        
+        # Bucket by id and sum; then put ids back in first-seen order so
+        # the stable sort below breaks ties the way the lists ranked them
+        _, first_seen, inverse = np.unique(all_ids, return_index=True, return_inverse=True)
+        fused = np.bincount(inverse, weights=weights)
+        appearance = np.argsort(first_seen, kind='stable')
+        first_seen, fused = first_seen[appearance], fused[appearance]
+        
+        order = np.argsort(-fused, kind='stable')
+        if n_results is not None:
+            order = order[:n_results]
+        
+        # Only the winners become output dicts. Vector hits come first in
+        # candidates, so docs found by both keep the vector-side result
+        # (with its distance); inputs are left untouched
         merged = []
-        seen_ids = set()
-        
-        # Create a map for quick lookup
-        all_results_map = {r['id']: r for r in vector_results + keyword_results}
-        
-        for doc_id in sorted_ids:
-            if doc_id in all_results_map:
-                result = all_results_map[doc_id]
-                result['rrf_score'] = scores[doc_id]
-                merged.append(result)
+        for pos, score in zip(first_seen[order].tolist(), fused[order].tolist()):
+            result = dict(candidates[pos])
+            result['rrf_score'] = score
+            merged.append(result)
         
         return merged
 
@@ -286,6 +599,7 @@ class ChromeRAGSystem:
         Returns:
             Dictionary with statistics about indexed code
         """
+        self.flush()
         total_chunks = self.collection.count()
         
         # Get sample to analyze distribution
@@ -298,34 +612,38 @@ class ChromeRAGSystem:
                 'unique_files': 0
             }
         
-        # Get all metadata (this could be slow for large collections)
-        all_data = self.collection.get(limit=sample_size)
+        # One consistent view: a background rebuild may swap these at any time
+        with self._bm25_swap_lock:
+            bm25, ids, meta_columns = self.bm25, self.bm25_ids, self.bm25_meta_columns
+            bm25_lang, bm25_ftype = self.bm25_lang, self.bm25_ftype
+        
+        if bm25 and len(ids) == total_chunks:
+            # The keyword index covers the whole collection: reuse its arrays
+            types = bm25_ftype
+            languages = bm25_lang
+            files = _metadata_field(meta_columns, 'filepath', '', total_chunks)
+        else:
+            # Get sample metadata (a full scan could be slow for large collections)
+            all_data = self.collection.get(limit=sample_size, include=['metadatas'])
+            metadatas = all_data.get('metadatas') or []
+            types = np.array([m.get('type', 'unknown') for m in metadatas], dtype=object)
+            languages = np.array([m.get('language', 'unknown') for m in metadatas], dtype=object)
+            files = np.fromiter((m.get('filepath', '') for m in metadatas), dtype=object, count=len(metadatas))
         
-        stats = {
+        return {
             'total_chunks': total_chunks,
-            'chunks_by_type': defaultdict(int),
-            'chunks_by_language': defaultdict(int),
-            'files': set()
+            'chunks_by_type': _count_values(types),
+            'chunks_by_language': _count_values(languages),
+            'unique_files': len(np.unique(files))
         }
-        
-        if all_data and 'metadatas' in all_data:
-            for metadata in all_data['metadatas']:
-                stats['chunks_by_type'][metadata.get('type', 'unknown')] += 1
-                stats['chunks_by_language'][metadata.get('language', 'unknown')] += 1
-                stats['files'].add(metadata.get('filepath', ''))
-        
-        stats['unique_files'] = len(stats['files'])
-        del stats['files']  # Don't include the set in return
-        
-        # Convert defaultdicts to regular dicts
-        stats['chunks_by_type'] = dict(stats['chunks_by_type'])
-        stats['chunks_by_language'] = dict(stats['chunks_by_language'])
-        
-        return stats
     
     def clear_collection(self):
         """Delete and recreate the collection"""
-        self.logger.warning(f"Deleting collection '{self.collection_name}'")
+        self.logger.warning("Deleting collection '%s'", self.collection_name)
+        # Buffered chunks belong to the collection being deleted
+        self._pending_ids = []
+        self._pending_docs = []
+        self._pending_metas = []
         self.client.delete_collection(self.collection_name)
         
         self.collection = self.client.get_or_create_collection(
@@ -333,8 +651,14 @@ class ChromeRAGSystem:
             embedding_function=self.embedding_fn
         )
         
-        self._chunk_counter = 0
-        self.bm25 = None # Reset BM25
+        # Wait out any background rebuild so it can't reinstall old data
+        with self._bm25_lock:
+            self.bm25 = None # Reset BM25
+            # The empty index is current for the new, empty collection
+            self._corpus_version += 1
+            self._bm25_version = self._corpus_version
+            shutil.rmtree(self._bm25_path, ignore_errors=True)
+        self._bm25_candidates.cache_clear()
         self.logger.info("Collection cleared and recreated")
     
     def _format_get_results(self, results: Dict) -> List[Dict]:
@@ -342,12 +666,11 @@ class ChromeRAGSystem:
         formatted = []
         
         if results and 'documents' in results:
-            for i, doc in enumerate(results['documents']):
-                formatted.append({
-                    'content': doc,
-                    'metadata': results['metadatas'][i] if results['metadatas'] else {},
-                    'id': results['ids'][i] if results['ids'] else None
-                })
+            docs = results['documents']
+            metadatas = results['metadatas'] or [{}] * len(docs)
+            ids = results['ids'] or [None] * len(docs)
+            for doc, metadata, doc_id in zip(docs, metadatas, ids):
+                formatted.append({'content': doc, 'metadata': metadata, 'id': doc_id})
         
         return formatted
     
@@ -356,13 +679,12 @@ class ChromeRAGSystem:
         formatted = []
         
         if results and 'documents' in results and results['documents']:
-            for i, doc in enumerate(results['documents'][0]):
-                formatted.append({
-                    'content': doc,
-                    'metadata': results['metadatas'][0][i] if results['metadatas'] else {},
-                    'distance': results['distances'][0][i] if results['distances'] else None,
-                    'id': results['ids'][0][i] if results['ids'] else None
-                })
+            docs = results['documents'][0]
+            metadatas = results['metadatas'][0] if results['metadatas'] else [{}] * len(docs)
+            distances = results['distances'][0] if results['distances'] else [None] * len(docs)
+            ids = results['ids'][0] if results['ids'] else [None] * len(docs)
+            for doc, metadata, distance, doc_id in zip(docs, metadatas, distances, ids):
+                formatted.append({'content': doc, 'metadata': metadata, 'distance': distance, 'id': doc_id})
         
         return formatted
 
@@ -373,9 +695,13 @@ class VulnerabilityAnalyzer:
     This is a framework - integrate with your preferred AI API
     """
     
-    def __init__(self, rag_system: ChromeRAGSystem):
+    def __init__(self, rag_system: ChromeRAGSystem, model_version: str = "template"):
         self.rag = rag_system
         self.logger = get_logger()
+        self.model_version = model_version
+        # (content hash, model_version) -> analysis, so identical files are
+        # only sent to the model once
+        self._analysis_cache: Dict[Tuple[str, str], Dict] = {}
     
     async def analyze_file(self, filepath: str) -> Dict:
         """
@@ -390,14 +716,28 @@ class VulnerabilityAnalyzer:
         Returns:
             Dictionary with analysis results
         """
-        with open(filepath, 'r', encoding='utf-8') as f:
-            code = f.read()
-        
-        self.logger.info(f"Analyzing {filepath}")
+        with open(filepath, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < _ANALYZE_MMAP_THRESHOLD:
+                source = contextlib.nullcontext(f.read())
+            else:
+                source = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            with source as data:
+                cache_key = (hashlib.blake2b(data, digest_size=16).hexdigest(), self.model_version)
+                cached = self._analysis_cache.get(cache_key)
+                # Decoded only on a miss; large files straight from the mapping
+                code = str(data, 'utf-8', 'replace') if cached is None else None
+        
+        if cached is not None:
+            self.logger.info("Reusing analysis of identical content for %s", filepath)
+            return {**cached, 'filepath': filepath}
+        
+        self.logger.info("Analyzing %s", filepath)
         
         # Step 1: Get initial context from RAG
         filename = filepath.split('/')[-1]
-        context_chunks = self.rag.retrieve_context(
+        # Retrieval blocks on Chroma, so keep it off the event loop
+        context_chunks = await asyncio.to_thread(
+            self.rag.retrieve_context,
             f"security vulnerabilities in {filename}",
             n_results=3
         )
@@ -421,9 +761,11 @@ Please identify any potential security issues."""
         # TODO: Send to your AI API
         # response = await your_ai_api.complete(prompt)
         
-        return {
+        analysis = {
             'filepath': filepath,
             'prompt_length': len(prompt),
             'context_chunks_used': len(context_chunks),
             'vulnerabilities': []  # Parse from AI response
-        }
\ No newline at end of file
+        }
+        self._analysis_cache[cache_key] = analysis
+        return dict(analysis)
\ No newline at end of file
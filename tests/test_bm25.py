@@ -0,0 +1,97 @@
+import sys
+import os
+import math
+import shutil
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from utils.bm25 import BM25Index, tokenize
+
+CORPUS = [
+    "const int kMaxRetries = 5;",
+    "def authenticate_user(user, password): return check(user, password)",
+    "int RetryCount(int retries) { return retries + kMaxRetries; }",
+    "class LoginHandler { void OnLogin(User user); }",
+    "",
+]
+
+
+def reference_scores(corpus, query_tokens, k1=1.5, b=0.75):
+    """Textbook Okapi BM25 with the Lucene IDF, one document at a time"""
+    n = len(corpus)
+    avgdl = sum(len(doc) for doc in corpus) / n
+    scores = []
+    for doc in corpus:
+        score = 0.0
+        for token in query_tokens:
+            df = sum(1 for d in corpus if token in d)
+            if not df:
+                continue
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+            tf = doc.count(token)
+            score += idf * tf / (tf + k1 * (1 - b + b * len(doc) / avgdl))
+        scores.append(score)
+    return scores
+
+
+def test_scores_match_reference():
+    corpus = [tokenize(doc) for doc in CORPUS]
+    index = BM25Index(corpus)
+    assert len(index) == len(CORPUS)
+    
+    for query in ("kMaxRetries", "user password", "int retries kmaxretries", "user user"):
+        tokens = tokenize(query)
+        scores = index.get_scores(tokens)
+        assert scores.shape == (len(CORPUS),)
+        # Postings are stored as float32
+        np.testing.assert_allclose(scores, reference_scores(corpus, tokens), rtol=1e-5)
+    print("✅ BM25 scores match the reference")
+
+
+def test_empty_and_unknown_queries():
+    index = BM25Index(tokenize(doc) for doc in CORPUS)
+    
+    for tokens in ([], ["no_such_token"], tokenize("!!! ???")):
+        scores = index.get_scores(tokens)
+        assert scores.shape == (len(CORPUS),)
+        assert not scores.any()
+    
+    # Unknown tokens are ignored alongside known ones
+    np.testing.assert_array_equal(
+        index.get_scores(["kmaxretries", "no_such_token"]),
+        index.get_scores(["kmaxretries"])
+    )
+    
+    empty = BM25Index([])
+    assert len(empty) == 0
+    assert empty.get_scores(["anything"]).shape == (0,)
+    print("✅ Empty and unknown queries score zero")
+
+
+def test_save_load_roundtrip():
+    index = BM25Index(tokenize(doc) for doc in CORPUS)
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmp_dir, "index")
+        index.save(path)
+        # Saving again replaces the previous copy
+        index.save(path)
+        loaded = BM25Index.load(path)
+        
+        assert len(loaded) == len(index)
+        assert loaded.vocab == index.vocab
+        assert isinstance(loaded.data, np.memmap)
+        for query in ("kMaxRetries", "user password", "missing"):
+            tokens = tokenize(query)
+            np.testing.assert_array_equal(loaded.get_scores(tokens), index.get_scores(tokens))
+    finally:
+        shutil.rmtree(tmp_dir)
+    print("✅ BM25 index survives save/load (memory-mapped)")
+
+
+if __name__ == "__main__":
+    test_scores_match_reference()
+    test_empty_and_unknown_queries()
+    test_save_load_roundtrip()
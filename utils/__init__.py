@@ -1,8 +1,17 @@
 """
 Utilities package for logging and helpers
+Submodules are imported on first attribute access (PEP 562), so importing
+one helper does not pull in Rich or SQLite setup for the others
 """
 
-from .logger import setup_logger, get_logger
-from .state_manager import StateManager
-
 __all__ = ['setup_logger', 'get_logger', 'StateManager']
+
+
+def __getattr__(name: str):
+    if name in ('setup_logger', 'get_logger'):
+        from . import logger
+        return getattr(logger, name)
+    if name == 'StateManager':
+        from .state_manager import StateManager
+        return StateManager
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Sparse BM25 keyword index
+Term weights are scored once at build time and stored term-major in CSR
+arrays, so a query only sums the posting rows of its own tokens
+"""
+
+import json
+import os
+import shutil
+import string
+from collections import Counter
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+
+# Punctuation becomes a token boundary; '_' is kept as part of identifiers
+_PUNCT_TRANS = str.maketrans({ch: ' ' for ch in string.punctuation if ch != '_'})
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase and split text on whitespace and punctuation"""
+    return text.lower().translate(_PUNCT_TRANS).split()
+
+
+class BM25Index:
+    """
+    Okapi BM25 with eager (index-time) scoring
+
+    Each posting stores IDF(t) * TF(t,D) / (TF(t,D) + k1 * (1 - b + b * |D| / Lavg)),
+    with the non-negative Lucene IDF log(1 + (N - df + 0.5) / (df + 0.5))
+    """
+
+    def __init__(self, tokenized_corpus: Iterable[List[str]], k1: float = 1.5, b: float = 0.75):
+        self.vocab: Dict[str, int] = {}
+        term_ids = []
+        doc_ids = []
+        term_freqs = []
+        doc_lens = []
+
+        # Single pass: assign term ids and collect (term, doc, tf) triples
+        for doc_id, tokens in enumerate(tokenized_corpus):
+            doc_lens.append(len(tokens))
+            for term, tf in Counter(tokens).items():
+                term_ids.append(self.vocab.setdefault(term, len(self.vocab)))
+                doc_ids.append(doc_id)
+                term_freqs.append(tf)
+
+        self.num_docs = len(doc_lens)
+        num_terms = len(self.vocab)
+        rows = np.array(term_ids, dtype=np.int64)
+        cols = np.array(doc_ids, dtype=np.int32)
+        tf = np.array(term_freqs, dtype=np.float64)
+        doc_len = np.array(doc_lens, dtype=np.float64)
+
+        df = np.bincount(rows, minlength=num_terms)
+        idf = np.log((self.num_docs - df + 0.5) / (df + 0.5) + 1.0)
+        avgdl = doc_len.mean() if self.num_docs and doc_len.mean() > 0 else 1.0
+
+        weights = idf[rows] * tf / (tf + k1 * (1.0 - b + b * doc_len[cols] / avgdl))
+
+        # Group postings by term (COO -> CSR)
+        order = np.argsort(rows, kind='stable')
+        self.indices = cols[order]
+        self.data = weights[order].astype(np.float32)
+        self.indptr = np.zeros(num_terms + 1, dtype=np.int64)
+        np.cumsum(df, out=self.indptr[1:])
+
+    def __len__(self) -> int:
+        return self.num_docs
+
+    def save(self, path: str):
+        """
+        Write the index to a directory, replacing any previous copy
+
+        Arrays are stored as .npy so load() can memory-map them
+        """
+        tmp_path = path + '.tmp'
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+
+        np.save(os.path.join(tmp_path, 'indptr.npy'), self.indptr)
+        np.save(os.path.join(tmp_path, 'indices.npy'), self.indices)
+        np.save(os.path.join(tmp_path, 'data.npy'), self.data)
+        # Terms in id order; ids are implied by position
+        terms = sorted(self.vocab, key=self.vocab.__getitem__)
+        with open(os.path.join(tmp_path, 'vocab.json'), 'w', encoding='utf-8') as f:
+            json.dump({'num_docs': self.num_docs, 'terms': terms}, f)
+
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'BM25Index':
+        """Load an index written by save(), memory-mapping the posting arrays"""
+        index = cls.__new__(cls)
+        with open(os.path.join(path, 'vocab.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+        index.num_docs = meta['num_docs']
+        index.vocab = {term: i for i, term in enumerate(meta['terms'])}
+        index.indptr = np.load(os.path.join(path, 'indptr.npy'), mmap_mode='r')
+        index.indices = np.load(os.path.join(path, 'indices.npy'), mmap_mode='r')
+        index.data = np.load(os.path.join(path, 'data.npy'), mmap_mode='r')
+        return index
+
+    def get_scores(self, query_tokens: List[str]) -> np.ndarray:
+        """
+        Score every document against a tokenized query
+
+        Args:
+            query_tokens: Query tokens (repeated tokens count again, as in BM25Okapi)
+
+        Returns:
+            Array of scores, one per document in corpus order
+        """
+        term_ids = [self.vocab[token] for token in query_tokens if token in self.vocab]
+        if not term_ids:
+            return np.zeros(self.num_docs, dtype=np.float64)
+
+        # Gather every posting row the query touches, then reduce by document
+        # in one pass (a sparse row-sum without scipy)
+        rows = [slice(self.indptr[t], self.indptr[t + 1]) for t in term_ids]
+        if len(rows) == 1:
+            doc_ids, weights = self.indices[rows[0]], self.data[rows[0]]
+        else:
+            doc_ids = np.concatenate([self.indices[r] for r in rows])
+            weights = np.concatenate([self.data[r] for r in rows])
+        return np.bincount(doc_ids, weights=weights, minlength=self.num_docs)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Per-file cache of parse results
+Stores serialized chunker output for each file together with the hash of
+the content it was parsed from, so re-indexing unchanged content skips
+tree-sitter parsing entirely
+"""
+
+import hashlib
+import os
+import sqlite3
+from pathlib import Path
+from typing import Optional
+from .logger import get_logger
+
+
+# Bump when chunker output changes so entries from older code are never reused
+CACHE_VERSION = 1
+
+
+def make_cache_key(tag: str, filepath: str) -> bytes:
+    """
+    Build the cache key for one file's parse results
+    
+    Args:
+        tag: Identifies what produced the chunks (chunker, language, query)
+        filepath: File path as stored in its chunks
+        
+    Returns:
+        Digest that also covers CACHE_VERSION
+    """
+    digest = hashlib.sha256(f"v{CACHE_VERSION}\0{tag}\0".encode())
+    digest.update(filepath.encode('utf-8', 'surrogateescape'))
+    return digest.digest()
+
+
+class ASTCache:
+    """
+    SQLite-backed blob store for parse results, one row per file
+    Each row records the content hash it was parsed from; a lookup with a
+    different hash misses, and the following put() overwrites the row, so
+    the cache holds at most one version of each file
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.logger = get_logger()
+        # Opened lazily so each worker process gets its own connection
+        self._conn = None
+        self._pid = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the cache database on first use in this process"""
+        if self._conn is None or self._pid != os.getpid():
+            # A connection inherited across fork() must not be used (or
+            # closed) in the child, so it is simply replaced
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            # Caches from before rows were keyed by path are simply dropped
+            conn.execute("DROP TABLE IF EXISTS ast_cache")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS parse_cache "
+                "(key BLOB PRIMARY KEY, content_hash TEXT, blob BLOB)"
+            )
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def get(self, key: bytes, content_hash: str) -> Optional[bytes]:
+        """Get a cached blob, or None on miss or if the file's content changed"""
+        try:
+            row = self._connect().execute(
+                "SELECT blob FROM parse_cache WHERE key = ? AND content_hash = ?",
+                (key, content_hash)
+            ).fetchone()
+            return row[0] if row else None
+        except Exception as e:
+            self.logger.warning("AST cache lookup failed: %s", e)
+            return None
+
+    def put(self, key: bytes, content_hash: str, blob: bytes):
+        """Store a blob, replacing the file's previous entry"""
+        try:
+            self._connect().execute(
+                "INSERT OR REPLACE INTO parse_cache (key, content_hash, blob) VALUES (?, ?, ?)",
+                (key, content_hash, blob)
+            )
+        except Exception as e:
+            self.logger.warning("AST cache write failed: %s", e)
+
+    def clear(self):
+        """Delete all cached entries"""
+        try:
+            if self._conn is not None:
+                if self._pid == os.getpid():
+                    self._conn.close()
+                self._conn = None
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists(self.db_path + suffix):
+                    os.remove(self.db_path + suffix)
+        except Exception as e:
+            self.logger.error("Failed to clear AST cache: %s", e)
@@ -1,24 +1,41 @@
 #!/usr/bin/env python3
 """
 Professional logging system with colored output and progress tracking
+
+Log records go through a plain stderr handler by default; set
+CRAG_RICH_LOGS=1 for Rich's colored console handler (slower per record)
 """
 
+import functools
 import logging
+import os
 import sys
 from pathlib import Path
-from typing import Optional
-from rich.console import Console
-from rich.logging import RichHandler
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn, TimeRemainingColumn
+from typing import Optional, TYPE_CHECKING
+
+# Rich is imported on first use, so importing this module stays cheap
+if TYPE_CHECKING:
+    from rich.console import Console
+    from rich.progress import Progress
+
 
+@functools.cache
+def get_console() -> 'Console':
+    """Global console for rich output, created on first use"""
+    from rich.console import Console
+    return Console()
 
-# Global console for rich output
-console = Console()
+
+def __getattr__(name: str):
+    # Keep `from utils.logger import console` working
+    if name == 'console':
+        return get_console()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def setup_logger(name: str = "chrome_rag", log_file: Optional[str] = None, level: str = "INFO") -> logging.Logger:
     """
-    Setup a logger with rich console output and optional file logging
+    Setup a logger with console output and optional file logging
     
     Args:
         name: Logger name
@@ -34,14 +51,21 @@ def setup_logger(name: str = "chrome_rag", log_file: Optional[str] = None, level
     # Remove existing handlers
     logger.handlers.clear()
     
-    # Rich console handler
-    console_handler = RichHandler(
-        console=console,
-        show_time=True,
-        show_path=False,
-        markup=True,
-        rich_tracebacks=True
-    )
+    if os.environ.get('CRAG_RICH_LOGS'):
+        from rich.logging import RichHandler
+        
+        # Rich console handler
+        console_handler = RichHandler(
+            console=get_console(),
+            show_time=True,
+            show_path=False,
+            markup=True,
+            rich_tracebacks=True
+        )
+    else:
+        # Plain handler: hot loops can log hundreds of records per second
+        console_handler = logging.StreamHandler(sys.stderr)
+        console_handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(message)s'))
     console_handler.setLevel(getattr(logging, level.upper()))
     logger.addHandler(console_handler)
     
@@ -69,42 +93,46 @@ def get_logger(name: str = "chrome_rag") -> logging.Logger:
     return logger
 
 
-def create_progress_bar() -> Progress:
+def create_progress_bar() -> 'Progress':
     """Create a rich progress bar for tracking long operations"""
+    from rich.progress import (
+        Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn, TimeRemainingColumn
+    )
+    
     return Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
         BarColumn(),
         TaskProgressColumn(),
         TimeRemainingColumn(),
-        console=console
+        console=get_console()
     )
 
 
 def print_success(message: str):
     """Print a success message"""
-    console.print(f"[green]✓[/green] {message}")
+    get_console().print(f"[green]✓[/green] {message}")
 
 
 def print_error(message: str):
     """Print an error message"""
-    console.print(f"[red]✗[/red] {message}")
+    get_console().print(f"[red]✗[/red] {message}")
 
 
 def print_warning(message: str):
     """Print a warning message"""
-    console.print(f"[yellow]⚠[/yellow] {message}")
+    get_console().print(f"[yellow]⚠[/yellow] {message}")
 
 
 def print_info(message: str):
     """Print an info message"""
-    console.print(f"[blue]ℹ[/blue] {message}")
+    get_console().print(f"[blue]ℹ[/blue] {message}")
 
 
 def print_header(message: str):
     """Print a header message"""
-    console.print(f"\n[bold cyan]{message}[/bold cyan]")
-    console.print("[cyan]" + "=" * len(message) + "[/cyan]\n")
+    get_console().print(f"\n[bold cyan]{message}[/bold cyan]")
+    get_console().print("[cyan]" + "=" * len(message) + "[/cyan]\n")
 
 
 def print_stats(stats: dict):
@@ -118,4 +146,4 @@ def print_stats(stats: dict):
     for key, value in stats.items():
         table.add_row(key, str(value))
     
-    console.print(table)
+    get_console().print(table)
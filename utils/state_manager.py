@@ -7,26 +7,145 @@ Tracks file modification times and hashes to skip unchanged files
 import sqlite3
 import hashlib
 import os
-from pathlib import Path
-from typing import Optional, Tuple, Set
+import threading
+from typing import Optional, Tuple, Set, Dict, List
 from .logger import get_logger
 
+try:
+    import xxhash
+except ImportError:  # Optional: fall back to BLAKE2b from the standard library
+    xxhash = None
+
+# Stays under SQLite's default limit of 999 bound parameters per statement
+_MAX_SQL_PARAMS = 900
+
+# Fixed statement texts: sqlite3 caches compiled statements per connection,
+# keyed on the SQL string, so each is parsed once per connection
+_SELECT_STATE = "SELECT mtime, file_hash FROM files WHERE filepath = ?"
+# Every batch binds exactly _MAX_SQL_PARAMS values (short batches are padded
+# with NULL, which matches no row), so one statement serves all batch sizes
+_SELECT_STATE_BATCH = (
+    "SELECT filepath, mtime, file_hash FROM files WHERE filepath IN ("
+    + ",".join("?" * _MAX_SQL_PARAMS) + ")"
+)
+_UPSERT_STATE = (
+    "INSERT OR REPLACE INTO files (filepath, mtime, file_hash, last_indexed) "
+    "VALUES (?, ?, ?, CURRENT_TIMESTAMP)"
+)
+
+# Buffered mark_processed rows written per transaction
+_FLUSH_THRESHOLD = 1000
+
+# Read size for fast_hash
+_HASH_BUFFER_SIZE = 1 << 20
+
+
+def _new_hasher():
+    """Content hasher and its tag: xxh3 if xxhash is installed, else BLAKE2b"""
+    if xxhash is not None:
+        return 'xxh3', xxhash.xxh3_64()
+    return 'b2', hashlib.blake2b(digest_size=8)
+
+
+def content_hash(data: bytes) -> str:
+    """
+    Hash file content that is already in memory (or mapped)
+    Gives the same digest as StateManager.fast_hash on the file itself
+    """
+    tag, hasher = _new_hasher()
+    hasher.update(data)
+    # Tagged so digests from the other algorithm never compare equal
+    return f"{tag}:{hasher.hexdigest()}"
+
+
 class StateManager:
     """
     Manages the indexing state database (SQLite)
     Tracks which files have been indexed and their last modification time/hash
     """
     
-    def __init__(self, db_path: str = "index_state.db"):
+    def __init__(self, db_path: str = "index_state.db", in_memory: bool = False):
+        """
+        Args:
+            db_path: State database file
+            in_memory: Work on an in-memory copy of db_path (no fsyncs while
+                indexing); it is written back by snapshot() or close()
+        """
         self.db_path = db_path
         self.logger = get_logger()
+        # One WAL connection per thread; reads run concurrently, writes are
+        # serialized by _write_lock. _generation retires every thread's
+        # connection at once on close()/clear()
+        self._tls = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._generation = 0
+        # (filepath, mtime, file_hash) rows waiting for the next flush()
+        self._pending: List[Tuple[str, float, Optional[str]]] = []
+        self._lock = threading.Lock()        # guards _pending and _connections
+        self._write_lock = threading.Lock()
+        # In-memory mode shares this one connection between all threads
+        self._memory_conn: Optional[sqlite3.Connection] = None
+        if in_memory:
+            self._memory_conn = sqlite3.connect(':memory:', check_same_thread=False,
+                                                isolation_level=None)
+            self._load_from_disk()
         self._init_db()
-        
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass  # Interpreter shutdown; nothing to do
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's WAL connection, opening it on first use"""
+        if self._memory_conn is not None:
+            return self._memory_conn
+        conn = getattr(self._tls, 'conn', None)
+        if conn is None or self._tls.generation != self._generation:
+            # check_same_thread=False only so close() can close it from elsewhere
+            conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False,
+                                   isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with self._lock:
+                self._connections.append(conn)
+            self._tls.conn = conn
+            self._tls.generation = self._generation
+        return conn
+    
+    def _close_connections(self):
+        """Close every thread's connection; threads reopen on next use"""
+        with self._lock:
+            connections, self._connections = self._connections, []
+            self._generation += 1
+        for conn in connections:
+            conn.close()
+    
+    def _load_from_disk(self):
+        """Seed the in-memory database with the state saved at db_path"""
+        if not os.path.exists(self.db_path):
+            return
+        try:
+            source = sqlite3.connect(self.db_path)
+            try:
+                source.backup(self._memory_conn)
+            finally:
+                source.close()
+        except Exception as e:
+            self.logger.warning("Failed to load index state from %s: %s", self.db_path, e)
+    
     def _init_db(self):
         """Initialize the SQLite database"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("""
+            with self._write_lock:
+                self._connect().execute("""
                     CREATE TABLE IF NOT EXISTS files (
                         filepath TEXT PRIMARY KEY,
                         mtime REAL,
@@ -35,77 +154,228 @@ class StateManager:
                     )
                 """)
         except Exception as e:
-            self.logger.error(f"Failed to initialize state database: {e}")
+            self.logger.error("Failed to initialize state database: %s", e)
 
-    def should_process(self, filepath: str) -> bool:
+    def should_process(self, filepath: str, mtime: Optional[float] = None) -> bool:
         """
         Check if a file needs to be processed
         Returns True if file is new or modified since last index
+        
+        Args:
+            filepath: File to check
+            mtime: Its current mtime if already known (e.g. from a directory
+                scan); stat'ed otherwise
         """
         try:
-            path = Path(filepath)
-            if not path.exists():
-                return False
-                
-            current_mtime = path.stat().st_mtime
+            current_mtime = mtime
+            if current_mtime is None:
+                try:
+                    current_mtime = os.stat(filepath).st_mtime
+                except OSError:
+                    return False  # Gone
             
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.execute(
-                    "SELECT mtime FROM files WHERE filepath = ?", 
-                    (str(filepath),)
-                )
-                row = cursor.fetchone()
-                
-                if row is None:
-                    return True  # New file
-                
-                last_mtime = row[0]
-                return current_mtime > last_mtime
+            self.flush()
+            cursor = self._connect().execute(_SELECT_STATE, (str(filepath),))
+            row = cursor.fetchone()
+            
+            if row is None:
+                return True  # New file
+            
+            last_mtime, last_hash = row
+            if current_mtime <= last_mtime:
+                return False
+            return not self._content_unchanged(str(filepath), current_mtime, last_hash)
                 
         except Exception as e:
-            self.logger.warning(f"Error checking state for {filepath}: {e}")
+            self.logger.warning("Error checking state for %s: %s", filepath, e)
             return True  # Process on error to be safe
 
-    def mark_processed(self, filepath: str):
-        """Mark a file as successfully processed"""
+    def should_process_batch(self, filepaths: List[str],
+                             mtimes: Optional[Dict[str, float]] = None) -> Dict[str, bool]:
+        """
+        Batch form of should_process: one connection, one query per 900 paths
+        
+        Args:
+            filepaths: Files to check
+            mtimes: Current mtimes if already known (e.g. from a directory
+                scan); files missing here are stat'ed
+            
+        Returns:
+            Dict mapping each path to True if it is new or modified
+        """
+        known = {}
+        try:
+            self.flush()
+            conn = self._connect()
+            conn.execute("PRAGMA temp_store=MEMORY")
+            for start in range(0, len(filepaths), _MAX_SQL_PARAMS):
+                group = filepaths[start:start + _MAX_SQL_PARAMS]
+                group += [None] * (_MAX_SQL_PARAMS - len(group))
+                for filepath, mtime, file_hash in conn.execute(_SELECT_STATE_BATCH, group):
+                    known[filepath] = (mtime, file_hash)
+        except Exception as e:
+            self.logger.warning("Error checking index state: %s", e)
+            known = {}  # Process everything on error to be safe
+        
+        mtimes = mtimes or {}
+        result = {}
+        for filepath in filepaths:
+            current_mtime = mtimes.get(filepath)
+            if current_mtime is None:
+                try:
+                    current_mtime = os.stat(filepath).st_mtime
+                except OSError:
+                    result[filepath] = False  # Gone, as in should_process
+                    continue
+            last_mtime, last_hash = known.get(filepath, (None, None))
+            result[filepath] = (
+                last_mtime is None
+                or (current_mtime > last_mtime
+                    and not self._content_unchanged(filepath, current_mtime, last_hash))
+            )
+        return result
+
+    @staticmethod
+    def fast_hash(filepath: str) -> str:
+        """
+        Hash a file's content in 1 MiB reads
+        
+        Returns:
+            Tagged digest, comparable with content_hash() of the same bytes
+        """
+        tag, hasher = _new_hasher()
+        buffer = memoryview(bytearray(_HASH_BUFFER_SIZE))
+        with open(filepath, 'rb', buffering=0) as f:
+            while n := f.readinto(buffer):
+                hasher.update(buffer[:n])
+        return f"{tag}:{hasher.hexdigest()}"
+
+    def _content_unchanged(self, filepath: str, current_mtime: float,
+                           last_hash: Optional[str]) -> bool:
+        """
+        Tie-break for a newer mtime: True if the content still matches the
+        recorded hash (e.g. the file was only touched), in which case the
+        new mtime is recorded so the file is not hashed again next time
+        """
+        if not last_hash:
+            return False
         try:
-            path = Path(filepath)
-            current_mtime = path.stat().st_mtime
+            if self.fast_hash(filepath) != last_hash:
+                return False
+        except OSError:
+            return False
+        self.mark_processed(filepath, current_mtime, last_hash)
+        return True
+
+    def mark_processed(self, filepath: str, mtime: Optional[float] = None,
+                       file_hash: Optional[str] = None):
+        """
+        Mark a file as successfully processed
+        Rows are buffered and written in batches; call flush() (or close())
+        when done
+        
+        Args:
+            filepath: File that was indexed
+            mtime: Its mtime when it was read, if known; stat'ed otherwise
+            file_hash: content_hash() of what was indexed, if known
+        """
+        try:
+            if mtime is None:
+                mtime = os.stat(filepath).st_mtime
             
-            # Calculate simple hash for verification (optional, can be slow for large files)
-            # For now relying on mtime is faster and usually sufficient
+            # mtime decides what to reprocess; the hash only settles the case
+            # where mtime moved but the content did not (see _content_unchanged)
             
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("""
-                    INSERT OR REPLACE INTO files (filepath, mtime, last_indexed)
-                    VALUES (?, ?, CURRENT_TIMESTAMP)
-                """, (str(filepath), current_mtime))
+            with self._lock:
+                self._pending.append((str(filepath), mtime, file_hash))
+                should_flush = len(self._pending) >= _FLUSH_THRESHOLD
+            if should_flush:
+                self.flush()
                 
         except Exception as e:
-            self.logger.error(f"Failed to update state for {filepath}: {e}")
+            self.logger.error("Failed to update state for %s: %s", filepath, e)
+
+    def flush(self):
+        """Write buffered mark_processed rows in a single transaction"""
+        with self._lock:
+            if not self._pending:
+                return
+            rows, self._pending = self._pending, []
+        
+        conn = self._connect()
+        with self._write_lock:
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany(_UPSERT_STATE, rows)
+                conn.execute("COMMIT")
+            except Exception as e:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                self.logger.error("Failed to write index state for %s files: %s", len(rows), e)
+
+    def snapshot(self, path: Optional[str] = None):
+        """
+        Copy the current state to a database file with SQLite's backup API
+        
+        Args:
+            path: Destination (default: db_path, i.e. persist in-memory state)
+        """
+        self.flush()
+        path = path or self.db_path
+        if self._memory_conn is None and path == self.db_path:
+            return  # Already on disk
+        try:
+            with self._write_lock:
+                destination = sqlite3.connect(path)
+                try:
+                    self._connect().backup(destination)
+                finally:
+                    destination.close()
+        except Exception as e:
+            self.logger.error("Failed to snapshot index state to %s: %s", path, e)
+
+    def close(self):
+        """Flush buffered rows and close every thread's database connection"""
+        self.flush()
+        if self._memory_conn is not None:
+            self.snapshot()
+            with self._write_lock:
+                self._memory_conn.close()
+                # Later use falls back to the snapshot on disk
+                self._memory_conn = None
+        self._close_connections()
 
     def get_all_indexed_files(self) -> Set[str]:
         """Get set of all currently indexed file paths"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.execute("SELECT filepath FROM files")
-                return {row[0] for row in cursor.fetchall()}
+            self.flush()
+            cursor = self._connect().execute("SELECT filepath FROM files")
+            return {row[0] for row in cursor.fetchall()}
         except Exception:
             return set()
 
     def remove_file(self, filepath: str):
         """Remove a file from state (e.g. if deleted)"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("DELETE FROM files WHERE filepath = ?", (str(filepath),))
+            # A buffered row for this file must not land after the delete
+            self.flush()
+            with self._write_lock:
+                self._connect().execute("DELETE FROM files WHERE filepath = ?", (str(filepath),))
         except Exception as e:
-            self.logger.error(f"Failed to remove state for {filepath}: {e}")
+            self.logger.error("Failed to remove state for %s: %s", filepath, e)
 
     def clear(self):
         """Clear all state"""
         try:
-            if os.path.exists(self.db_path):
-                os.remove(self.db_path)
+            with self._lock:
+                self._pending = []
+            self._close_connections()
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists(self.db_path + suffix):
+                    os.remove(self.db_path + suffix)
+            if self._memory_conn is not None:
+                with self._write_lock:
+                    self._memory_conn.execute("DELETE FROM files")
             self._init_db()
         except Exception as e:
-            self.logger.error(f"Failed to clear state: {e}")
+            self.logger.error("Failed to clear state: %s", e)
@@ -7,8 +7,7 @@ import time
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from rag import ChromeRAGSystem
-from config import CONFIG
+from config import get_config
 
 st.set_page_config(
     page_title="Chrome RAG System",
@@ -46,8 +45,33 @@ st.markdown("""
 
 @st.cache_resource
 def get_rag_system(db_path):
+    # Imported here so the page renders before Chroma and the embedding model load
+    from rag import ChromeRAGSystem
     return ChromeRAGSystem(db_path=db_path)
 
+def load_rag_system(db_path):
+    # Built on first use, so the page and tabs render without touching Chroma
+    try:
+        return get_rag_system(db_path)
+    except Exception as e:
+        st.error(f"Failed to load database: {e}")
+        return None
+
+@st.cache_data(ttl=300, max_entries=256, show_spinner=False)
+def cached_search(db_path, query, n_results, language, file_type):
+    # Reruns with unchanged inputs (e.g. moving an unrelated widget) skip
+    # embedding, search and fusion entirely
+    return get_rag_system(db_path).retrieve_context(
+        query=query,
+        n_results=n_results,
+        language=language,
+        file_type=file_type
+    )
+
+@st.cache_data(ttl=60, show_spinner=False)
+def cached_statistics(db_path):
+    return get_rag_system(db_path).get_statistics()
+
 def main():
     st.title("🔍 Chrome Source Code Search")
     st.markdown("Professional semantic search for Chromium codebase")
@@ -55,7 +79,7 @@ def main():
     # Sidebar Configuration
     with st.sidebar:
         st.header("Configuration")
-        db_path = st.text_input("Database Path", value=CONFIG.db_path)
+        db_path = st.text_input("Database Path", value=get_config().db_path)
         
         st.divider()
         
@@ -75,15 +99,10 @@ def main():
         st.divider()
         
         if st.button("Refresh Statistics"):
+            # Drop cached counts so the next load reflects newly indexed files
+            cached_statistics.clear()
             st.session_state.show_stats = True
 
-    # Initialize System
-    try:
-        rag = get_rag_system(db_path)
-    except Exception as e:
-        st.error(f"Failed to load database: {e}")
-        return
-
     # Tabs
     tab_search, tab_symbol, tab_stats = st.tabs(["Semantic Search", "Symbol Lookup", "Statistics"])
     
@@ -91,7 +110,7 @@ def main():
     with tab_search:
         query = st.text_input("Search Query", placeholder="e.g., buffer overflow protection in render frame")
         
-        if query:
+        if query and load_rag_system(db_path):
             with st.spinner("Searching..."):
                 start_time = time.time()
                 
@@ -99,12 +118,7 @@ def main():
                 lang_filter = None if language == "All" else language
                 type_filter = None if chunk_type == "All" else chunk_type
                 
-                results = rag.retrieve_context(
-                    query=query,
-                    n_results=n_results,
-                    language=lang_filter,
-                    file_type=type_filter
-                )
+                results = cached_search(db_path, query, n_results, lang_filter, type_filter)
                 
                 duration = time.time() - start_time
                 st.success(f"Found {len(results)} results in {duration:.3f}s")
@@ -136,7 +150,8 @@ def main():
         with col2:
             exact_match = st.checkbox("Exact Match", value=True)
             
-        if symbol_name:
+        rag = load_rag_system(db_path) if symbol_name else None
+        if rag:
             with st.spinner("Looking up symbol..."):
                 lang_filter = None if language == "All" else language
                 type_filter = None if chunk_type == "All" else chunk_type
@@ -162,8 +177,9 @@ def main():
 
     # --- Tab 3: Statistics ---
     with tab_stats:
-        if st.button("Load Statistics") or st.session_state.get('show_stats'):
-            stats = rag.get_statistics()
+        load_stats = st.button("Load Statistics") or st.session_state.get('show_stats')
+        if load_stats and load_rag_system(db_path):
+            stats = cached_statistics(db_path)
             
             col1, col2, col3 = st.columns(3)
             col1.metric("Total Chunks", stats['total_chunks'])